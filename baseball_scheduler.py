@@ -1,24 +1,15 @@
-from datetime import datetime, timedelta, date
+# 일정 생성/내보내기 라이브러리. 콘솔에서 실행하려면: python schedule_cli.py (--load FILE로 기존 LSDL 재내보내기)
+from datetime import timedelta, date
 import itertools
 import calendar
 import random
 import hashlib
+from collections import namedtuple
 
-### 입력 및 올스타 날짜 관련 함수
-def get_user_input():
-    num_teams = int(input("팀 수를 입력하세요 (예: 10): "))
-    opening_date_str = input("개막일을 입력하세요 (YYYY-MM-DD 형식): ")
-    games_between_teams = int(input("각 팀 간 총 경기 수 (예: 16): "))
-    allstar_week_n = int(input("올스타 주간은 7월 몇 번째 주인가요? (예: 2): "))
-    opening_date = datetime.strptime(opening_date_str, "%Y-%m-%d").date()
-    return num_teams, opening_date, games_between_teams, allstar_week_n
-
-def get_ootp_header_input():
-    schedule_type = input("OOTP 스케줄 type을 입력하세요 (예: CUSTOM): ").strip()
-    inter_league = input("인터리그 여부? (1=사용, 0=비사용): ").strip()
-    balanced_games = input("균형 일정 여부? (1=사용, 0=비사용): ").strip()
-    return schedule_type, inter_league, balanced_games
+# 배정 로직이 바뀌면 올려서 예전에 캐시된 일정을 무효화
+ENGINE_VERSION = "1"
 
+### 올스타 날짜 관련 함수
 def get_allstar_dates(year, week_num):
     # 7월의 모든 금요일을 찾고, 그 다음 토/일이 모두 7월인 경우 선택
     july_dates = []
@@ -46,7 +37,9 @@ def get_allstar_dates(year, week_num):
 
 
 ### 시리즈 생성: 주어진 경기수를 2연전, 3연전 등으로 분할
-def generate_series(total_games):
+def generate_series(total_games, lengths=None):
+    if lengths is not None and set(lengths) != {2, 3}:
+        return split_series_by_lengths(total_games, lengths)
     result = []
     while total_games > 0:
         if total_games == 2:
@@ -60,6 +53,19 @@ def generate_series(total_games):
             total_games -= 3
     return result
 
+### 전체 시리즈 목록: 모든 팀 조합에 대해 홈/원정 경기를 연전 단위로 나눔
+def build_series(num_teams, games_between_teams, start_rules=None):
+    lengths = get_series_lengths(start_rules)
+    all_series = []
+    for home, away in itertools.combinations(range(num_teams), 2):
+        home_games = games_between_teams // 2
+        away_games = games_between_teams - home_games
+        for l in generate_series(home_games, lengths):
+            all_series.append({'home': home, 'away': away, 'length': l})
+        for l in generate_series(away_games, lengths):
+            all_series.append({'home': away, 'away': home, 'length': l})
+    return all_series
+
 ### 올스타 및 월요일 등 휴식일을 제외한 사용 가능한 날짜 리스트 생성
 def get_available_dates(opening_date, allstar_fri, allstar_sat, allstar_sun, count=500):
     excluded = {allstar_fri, allstar_sat, allstar_sun}
@@ -73,134 +79,154 @@ def get_available_dates(opening_date, allstar_fri, allstar_sat, allstar_sun, cou
     return dates
 
 
-### 시리즈 시작 요일 조건: 2연전은 수/토, 3연전은 화/금
-def is_valid_series_start(series_length, start_date):
-    weekday = start_date.weekday()
-    if series_length == 2:
-        return weekday in (1, 3, 5)  # 화, 목, 토
-    elif series_length == 3:
-        return weekday in (1, 4)     # 화, 금 (그대로 유지)
-    return False
-
-def generate_schedule(num_teams, opening_date, games_between_teams, allstar_week_n, available_dates):
+### 시리즈 시작 규칙 (데이터): 연전 길이별 시작 요일(월=0), 월별 예외, 특정 날짜 허용/금지
+# 시대별로 다른 요일 패턴을 쓰려면 이 구조를 복사해서 바꾼 뒤 start_rules로 넘기면 됨
+DEFAULT_SERIES_START_RULES = {
+    "starts": {2: (1, 3, 5), 3: (1, 4)},  # 2연전: 화/목/토, 3연전: 화/금
+    "month_starts": {},                   # 예: {9: {2: (1, 3, 5, 6)}} → 9월에는 일요일 2연전도 허용
+    "extra_start_dates": (),              # 공휴일 등: 요일과 상관없이 모든 연전 시작 허용
+    "blocked_start_dates": (),            # 이 날짜에는 어떤 시리즈도 시작하지 않음
+}
+
+def get_series_lengths(start_rules=None):
+    rules = start_rules or DEFAULT_SERIES_START_RULES
+    return tuple(sorted(rules["starts"], reverse=True))
+
+def split_series_by_lengths(total_games, lengths):
+    # 허용된 길이만 쓰되 기본 패턴(3연전/2연전)을 우선: 기본 분할이 가능하면 그대로 쓰고,
+    # 아니면 기본 길이가 아닌 시리즈에 들어가는 경기 수가 가장 적은 분할 → 시리즈 수가 적은 분할 순
+    lengths = sorted(set(lengths), reverse=True)
+    default = generate_series(total_games)
+    if sum(default) == total_games and all(l in lengths for l in default):
+        return default
+
+    best = [(0, 0, ())] + [None] * total_games  # best[n] = (기본 외 경기 수, 시리즈 수, 분할)
+    for n in range(1, total_games + 1):
+        for l in lengths:
+            if l > n or best[n - l] is None:
+                continue
+            extra, count, parts = best[n - l]
+            candidate = (extra + (0 if l in (2, 3) else l), count + 1, parts + (l,))
+            if best[n] is None or candidate[:2] < best[n][:2]:
+                best[n] = candidate
+    if best[total_games] is None:
+        raise ValueError(f"{total_games}경기를 {lengths}연전으로 나눌 수 없습니다.")
+    return sorted(best[total_games][2], reverse=True)
+
+def compile_series_start_masks(available_dates, start_rules=None):
+    # 시즌마다 한 번만 계산: masks[연전 길이][날짜 인덱스] = 그 날 시작할 수 있는지
+    # (요일 규칙 + 남은 날짜 수 + 연속된 날짜인지까지 미리 반영)
+    rules = start_rules or DEFAULT_SERIES_START_RULES
+    starts = {l: frozenset(w) for l, w in rules["starts"].items()}
+    month_starts = {
+        m: {l: frozenset(w) for l, w in by_length.items()}
+        for m, by_length in rules.get("month_starts", {}).items()
+    }
+    extra = set(rules.get("extra_start_dates", ()))
+    blocked = set(rules.get("blocked_start_dates", ()))
+
+    n = len(available_dates)
+    # run[i] = i번째 날짜부터 끊기지 않고 이어지는 날짜 수
+    run = [1] * n
+    for i in range(n - 2, -1, -1):
+        if (available_dates[i + 1] - available_dates[i]).days == 1:
+            run[i] = run[i + 1] + 1
+
+    masks = {}
+    for length, weekdays in starts.items():
+        mask = bytearray(n)
+        for i, d in enumerate(available_dates):
+            if run[i] < length or d in blocked:
+                continue
+            allowed = month_starts.get(d.month, {}).get(length, weekdays)
+            if d.weekday() in allowed or d in extra:
+                mask[i] = 1
+        masks[length] = mask
+    return masks
+
+def get_opening_series_length(masks, present_lengths):
+    # 실제로 있는 연전 중 개막일(인덱스 0)에 시작할 수 있는 가장 짧은 것 (마스크에 연속 날짜 조건도 들어 있음)
+    # 없으면 0 → 개막 시리즈 없이 마스크상 첫 시작 가능일부터 배정 (예: 2연전이 없는 시즌의 토요일 개막)
+    allowed = [l for l in present_lengths if l in masks and masks[l] and masks[l][0]]
+    return min(allowed) if allowed else 0
+
+def generate_schedule(num_teams, opening_date, games_between_teams, allstar_week_n, available_dates, rng=None,
+                      start_rules=None, all_series=None):
     year = opening_date.year
     allstar_fri, allstar_sat, allstar_sun = get_allstar_dates(year, allstar_week_n)
     teams = list(range(num_teams))
-    pairings = list(itertools.combinations(teams, 2))
-    all_series = []
+    lengths = get_series_lengths(start_rules)
 
-    for home, away in pairings:
-        home_games = games_between_teams // 2
-        away_games = games_between_teams - home_games
-        for l in generate_series(home_games):
-            all_series.append({'home': home, 'away': away, 'length': l})
-        for l in generate_series(away_games):
-            all_series.append({'home': away, 'away': home, 'length': l})
+    # 미리 만든 시리즈 목록을 받으면 그대로 재사용 (섞기 전에 복사해서 원본은 그대로 둠)
+    if all_series is None:
+        all_series = build_series(num_teams, games_between_teams, start_rules)
+    else:
+        all_series = list(all_series)
+
+    (rng or random).shuffle(all_series)
 
-    random.shuffle(all_series)
+    # 시작 가능 여부는 날짜 인덱스별 마스크로 한 번만 계산
+    masks = compile_series_start_masks(available_dates, start_rules)
 
-    # 개막전 2연전 배정
-    opening_2games = []
+    # 개막 시리즈 배정 (개막일에 시작할 수 있는 가장 짧은 연전, 기본 규칙이면 토요일 2연전)
+    opening_length = get_opening_series_length(masks, {s['length'] for s in all_series})
+    opening_series = []
     used_teams = set()
     for s in all_series:
-        if s['length'] == 2 and s['home'] not in used_teams and s['away'] not in used_teams:
-            opening_2games.append(s)
+        if s['length'] == opening_length and s['home'] not in used_teams and s['away'] not in used_teams:
+            opening_series.append(s)
             used_teams.update([s['home'], s['away']])
-    for s in opening_2games:
+    for s in opening_series:
         all_series.remove(s)
 
     schedule = {}
     team_busy = {t: set() for t in teams}
 
     # 개막전 배정
-    for s in opening_2games:
+    for s in opening_series:
         for offset in range(s['length']):
             date_ = available_dates[offset]
             schedule.setdefault(date_, []).append((s['home'], s['away']))
             team_busy[s['home']].add(date_)
             team_busy[s['away']].add(date_)
 
-    start_idx = 2  # 개막전 이후부터 시작
-
-    # 시리즈 분리
-    three_game_series = [s for s in all_series if s['length'] == 3]
-    two_game_series = [s for s in all_series if s['length'] == 2]
-
-    # ⚾ 1단계: 3연전 먼저 배정
-    for idx in range(start_idx, len(available_dates)):
-        real_date = available_dates[idx]
-        placed_today = []
-        used_teams = set()
-
-        for s in three_game_series[:]:
-            if not is_valid_series_start(s['length'], real_date):
-                continue
-
-            days_needed = [idx + i for i in range(s['length'])]
-            if any(d >= len(available_dates) for d in days_needed):
-                continue
-
-            dates_needed = [available_dates[d] for d in days_needed]
-            if any((dates_needed[i+1] - dates_needed[i]).days != 1 for i in range(len(dates_needed) - 1)):
-                continue
-
-            if any(date in team_busy[s['home']] or date in team_busy[s['away']] for date in dates_needed):
-                continue
-
-            if s['home'] in used_teams or s['away'] in used_teams:
-                continue
-
-            for d_ in dates_needed:
-                schedule.setdefault(d_, []).append((s['home'], s['away']))
-                team_busy[s['home']].add(d_)
-                team_busy[s['away']].add(d_)
+    start_idx = opening_length  # 개막 시리즈 이후부터 시작 (개막 시리즈가 없으면 0부터, 마스크가 시작일을 거름)
 
-            used_teams.update([s['home'], s['away']])
-            placed_today.append(s)
-
-        for s in placed_today:
-            three_game_series.remove(s)
-
-        if not three_game_series:
-            break  # 3연전 다 배정됐으면 중단
-
-    # ⚾ 2단계: 2연전 배정
-    for idx in range(start_idx, len(available_dates)):
-        real_date = available_dates[idx]
-        placed_today = []
-        used_teams = set()
+    # ⚾ 긴 시리즈부터 배정 (기본 규칙: 3연전 → 2연전)
+    for length in lengths:
+        pending = [s for s in all_series if s['length'] == length]
+        mask = masks[length]
 
-        for s in two_game_series[:]:
-            if not is_valid_series_start(s['length'], real_date):
+        for idx in range(start_idx, len(available_dates)):
+            if not pending:
+                break  # 이 길이의 시리즈를 다 배정했으면 다음 길이로
+            if not mask[idx]:
                 continue
 
-            days_needed = [idx + i for i in range(s['length'])]
-            if any(d >= len(available_dates) for d in days_needed):
-                continue
-
-            dates_needed = [available_dates[d] for d in days_needed]
-            if any((dates_needed[i+1] - dates_needed[i]).days != 1 for i in range(len(dates_needed) - 1)):
-                continue
+            dates_needed = available_dates[idx:idx + length]
+            placed_today = []
+            used_teams = set()
 
-            if any(date in team_busy[s['home']] or date in team_busy[s['away']] for date in dates_needed):
-                continue
+            for s in pending:
+                if s['home'] in used_teams or s['away'] in used_teams:
+                    continue
 
-            if s['home'] in used_teams or s['away'] in used_teams:
-                continue
+                home_busy = team_busy[s['home']]
+                away_busy = team_busy[s['away']]
+                if any(d_ in home_busy or d_ in away_busy for d_ in dates_needed):
+                    continue
 
-            for d_ in dates_needed:
-                schedule.setdefault(d_, []).append((s['home'], s['away']))
-                team_busy[s['home']].add(d_)
-                team_busy[s['away']].add(d_)
+                for d_ in dates_needed:
+                    schedule.setdefault(d_, []).append((s['home'], s['away']))
+                    home_busy.add(d_)
+                    away_busy.add(d_)
 
-            used_teams.update([s['home'], s['away']])
-            placed_today.append(s)
+                used_teams.update([s['home'], s['away']])
+                placed_today.append(s)
 
-        for s in placed_today:
-            two_game_series.remove(s)
-
-        if not two_game_series:
-            break  # 2연전도 모두 배정되면 종료
+            if placed_today:
+                placed_ids = set(map(id, placed_today))
+                pending = [s for s in pending if id(s) not in placed_ids]
 
     # 올스타전 배정
     schedule.setdefault(allstar_sat, []).append(('올스타', '올스타'))
@@ -310,20 +336,252 @@ def stretch_schedule(schedule, opening_date, min_span=170, allstar_week_n=None):
 
     return new_schedule
 
+### 시즌 길이 하한: 이보다 짧은 일정은 만들 수 없음 (생성 결과와의 차이 = 최적성 갭)
+# (1) 팀당 하루 한 경기 + 월요일/올스타 주간 휴식 → 팀당 경기 수만큼 사용 가능한 날이 필요
+#     (홀수 팀이면 하루 최대 n//2경기라 전체 경기 수 기준이 더 큼)
+# (2) 시리즈는 화~일 한 주 안에서만 이어지고 시작 요일이 정해져 있음
+#     → 한 주에 넣을 수 있는 연전 조합으로 팀의 시리즈를 모두 담는 데 필요한 최소 주 수
+def get_week_patterns(start_rules=None):
+    # 화(1)~일(6)에 시작 규칙을 지키며 넣을 수 있는 연전 조합 중 더 넣을 수 없는 것만 반환
+    rules = start_rules or DEFAULT_SERIES_START_RULES
+    lengths = get_series_lengths(rules)
+    allowed = {l: set(w) for l, w in rules["starts"].items()}
+    for by_length in rules.get("month_starts", {}).values():
+        for l, w in by_length.items():
+            allowed.setdefault(l, set()).update(w)  # 월별 예외까지 합쳐야 하한이 안전함
+
+    found = set()
+
+    def fill(day, counts):
+        if day > 6:
+            found.add(tuple(counts))
+            return
+        fill(day + 1, counts)
+        for i, l in enumerate(lengths):
+            if day in allowed.get(l, ()) and day + l - 1 <= 6:
+                counts[i] += 1
+                fill(day + l, counts)
+                counts[i] -= 1
+
+    fill(1, [0] * len(lengths))
+    return lengths, [
+        p for p in found
+        if not any(q != p and all(a >= b for a, b in zip(q, p)) for q in found)
+    ]
+
+def get_min_series_weeks(counts, patterns):
+    # counts: 연전 길이별 시리즈 수. 한 길이만 담는 조합은 올림 나눗셈으로, 섞인 조합(1개까지)은 개수를 모두 시도
+    # 화~일 안에 하나도 못 넣는 연전이 있으면 None (그 시리즈는 배정되지 않으므로 주 단위 하한은 의미 없음)
+    most = [max(p[i] for p in patterns) for i in range(len(counts))]
+    if any(c and not m for c, m in zip(counts, most)):
+        return None
+
+    pure = {}
+    mixed = []
+    for p in patterns:
+        nonzero = [i for i, c in enumerate(p) if c]
+        if len(nonzero) == 1:
+            i = nonzero[0]
+            pure[i] = max(pure.get(i, 0), p[i])
+        elif nonzero:
+            mixed.append(p)
+
+    def ceil_div(a, b):
+        return -(-a // b)
+
+    if len(mixed) > 1 or any(c and i not in pure for i, c in enumerate(counts)):
+        # 조합이 복잡하면 단순 하한: 길이별 최대 개수, 한 주 6일
+        return max([ceil_div(c, m) for c, m in zip(counts, most) if c] or [0])
+
+    best = None
+    max_mixed = max(counts) if mixed else 0
+    for k in range(max_mixed + 1):
+        weeks = k
+        for i, c in enumerate(counts):
+            rest = c - k * (mixed[0][i] if mixed else 0)
+            if rest > 0:
+                weeks += ceil_div(rest, pure[i])
+        if best is None or weeks < best:
+            best = weeks
+    return best
+
+def compute_season_lower_bound(num_teams, opening_date, games_between_teams, allstar_week_n,
+                               all_series=None, start_rules=None, available_dates=None):
+    # available_dates: 미리 만든 날짜 목록 (충분히 길면 다시 계산하지 않고 그대로 씀)
+    allstar_fri, allstar_sat, allstar_sun = get_allstar_dates(opening_date.year, allstar_week_n)
+    if all_series is None:
+        all_series = build_series(num_teams, games_between_teams, start_rules)
+    rules = start_rules or DEFAULT_SERIES_START_RULES
+
+    # (1) 사용 가능한 날 수
+    team_games = [0] * num_teams
+    for s in all_series:
+        team_games[s['home']] += s['length']
+        team_games[s['away']] += s['length']
+    total_games = sum(s['length'] for s in all_series)
+    min_game_days = max(team_games or [0])
+    if num_teams >= 2:
+        min_game_days = max(min_game_days, -(-total_games // (num_teams // 2)))
+    if min_game_days == 0:
+        return {"min_game_days": 0, "min_weeks": 0, "last_date": opening_date, "days": 0}
+    if available_dates is not None and len(available_dates) >= min_game_days:
+        by_days = available_dates[min_game_days - 1]
+    else:
+        by_days = get_available_dates(opening_date, allstar_fri, allstar_sat, allstar_sun, min_game_days)[-1]
+
+    # (2) 주 단위 시리즈 배치 (특정 날짜 예외가 있으면 요일 규칙으로 묶을 수 없으므로 생략)
+    min_weeks = 0
+    by_weeks = opening_date
+    if not rules.get("extra_start_dates"):
+        lengths, patterns = get_week_patterns(rules)
+        team_counts = [[0] * len(lengths) for _ in range(num_teams)]
+        for s in all_series:
+            i = lengths.index(s['length'])
+            team_counts[s['home']][i] += 1
+            team_counts[s['away']][i] += 1
+        weeks = [get_min_series_weeks(c, patterns) for c in set(map(tuple, team_counts))]
+        min_weeks = 0 if None in weeks else max(weeks)
+        if min_weeks > 0:
+            # 개막 주 화요일부터 min_weeks번째 주의 가장 이른 시리즈 종료일
+            first_tuesday = opening_date - timedelta(days=(opening_date.weekday() - 1) % 7)
+            earliest_end = min(min(w) + l - 1 for l, w in rules["starts"].items() if w)
+            by_weeks = max(opening_date, first_tuesday + timedelta(days=7 * (min_weeks - 1) + earliest_end - 1))
+
+    last_date = max(by_days, by_weeks)
+    return {
+        "min_game_days": min_game_days,
+        "min_weeks": min_weeks,
+        "last_date": last_date,
+        "days": (last_date - opening_date).days + 1,
+    }
+
+def get_optimality_gap(schedule, opening_date, bound):
+    # 실제 시즌 길이(개막일 ~ 마지막 경기일)와 하한의 차이
+    _, last_day, _ = get_season_span(schedule)
+    days = (last_day - opening_date).days + 1 if last_day else 0
+    return {"days": days, "bound_days": bound["days"], "gap": days - bound["days"]}
+
+def format_gap_report(gap):
+    if gap["gap"] <= 0:
+        return f"🏁 시즌 길이 {gap['days']}일 = 하한 {gap['bound_days']}일 (최적)"
+    return f"📐 시즌 길이 {gap['days']}일 / 하한 {gap['bound_days']}일 (갭 +{gap['gap']}일)"
+
+### 배정: 하한 + 여유분으로 날짜 범위를 잡고, 시리즈가 남으면 여유분을 두 배로 늘려 다시 배정
+# 범위 안에서 모두 배정됐다면 더 긴 범위로 배정한 결과와 같음 (끝부분 날짜는 쓰이지 않았으므로)
+# 고정 상한은 없음. 남은 시리즈가 있어도 마지막 경기 뒤에 빈 날이 충분히 이어지면 멈춤:
+#   시작 규칙은 요일(월별 예외가 있으면 연 단위)로 반복되므로, 모든 팀이 쉬는 구간에서도 시작하지 못한
+#   시리즈는 더 뒤의 날짜에서도 시작할 수 없음 (특정 날짜 예외는 그 날짜까지 범위를 넓힌 뒤 판단)
+# available_dates: 미리 만든 날짜 목록 (충분히 길면 앞부분을 잘라 쓰고 다시 계산하지 않음)
+def get_idle_tail_days(start_rules=None):
+    # 빈 구간이 이만큼 이어지면 더 늘려도 소용없음: 반복 주기 + 가장 긴 연전
+    # (주기는 두 주: 올스타 금~일이 끼어도 온전한 한 주가 남음. 월별 예외가 있으면 1년 + 한 주)
+    rules = start_rules or DEFAULT_SERIES_START_RULES
+    period = 366 + 7 if rules.get("month_starts") else 14
+    return period + max(rules["starts"])
+
+def place_season(num_teams, opening_date, games_between_teams, allstar_week_n, all_series, seed=None,
+                 start_rules=None, bound=None, available_dates=None):
+    allstar_fri, allstar_sat, allstar_sun = get_allstar_dates(opening_date.year, allstar_week_n)
+    if bound is None:
+        bound = compute_season_lower_bound(num_teams, opening_date, games_between_teams, allstar_week_n,
+                                           all_series, start_rules, available_dates)
+    date_pool = available_dates
+    expected_games = sum(s['length'] for s in all_series)
+    rules = start_rules or DEFAULT_SERIES_START_RULES
+    idle_days = get_idle_tail_days(rules)
+    last_extra_start = max(rules.get("extra_start_dates", ()), default=None)
+
+    # 하한 마지막 날까지의 사용 가능한 날 수 + 여유분: 최소 한 주(화~일 6일), 긴 시즌은 하한의 1/8
+    # (생성 결과는 보통 하한보다 3~8% 길어서 대부분 첫 번째 배정에서 끝남. 모자라면 두 배씩 늘림)
+    excluded = {allstar_fri, allstar_sat, allstar_sun}
+    bound_count = max(bound["min_game_days"], sum(
+        1 for i in range(bound["days"])
+        if (opening_date + timedelta(days=i)).weekday() != 0 and opening_date + timedelta(days=i) not in excluded
+    ))
+    extra = max(6, bound_count // 8)
+
+    while True:
+        count = bound_count + extra
+        if date_pool is not None and len(date_pool) >= count:
+            available_dates = date_pool[:count]
+        else:
+            available_dates = get_available_dates(opening_date, allstar_fri, allstar_sat, allstar_sun, count)
+        rng = random.Random(seed) if seed is not None else None
+        schedule = generate_schedule(num_teams, opening_date, games_between_teams, allstar_week_n, available_dates,
+                                     rng=rng, start_rules=start_rules, all_series=all_series)
+        game_dates = [d for d, games in schedule.items() if any(g != ('올스타', '올스타') for g in games)]
+        placed_games = sum(1 for d in game_dates for g in schedule[d] if g != ('올스타', '올스타'))
+        if placed_games >= expected_games:
+            return schedule, available_dates
+
+        # 마지막 경기 뒤로 빈 날이 충분하고 특정 날짜 예외도 모두 범위 안이면 더 늘려도 같은 결과
+        last_game = max(game_dates, default=opening_date - timedelta(days=1))
+        idle = (available_dates[-1] - last_game).days if available_dates else 0
+        if idle >= idle_days and (last_extra_start is None or available_dates[-1] >= last_extra_start):
+            return schedule, available_dates
+        extra *= 2
+
+### 내보내기 공용 뷰: 날짜 정렬과 경기 목록, 경기 시작 시간을 한 번만 만들고 모든 출력기가 같이 읽음 (읽기 전용 튜플)
+# times[i][j]는 games[i][j]의 시작 시간 (올스타전은 ""). seed가 같으면 같은 시간이 나옴
+# game_times({(날짜, 홈, 원정): "HHMM"})를 주면 그 경기는 주어진 시간을 그대로 씀 (불러온 LSDL의 원래 시간)
+ScheduleView = namedtuple("ScheduleView", ["dates", "daynums", "games", "months", "times"])
+
+def prepare_schedule_view(schedule, opening_date, seed=0, game_times=None):
+    import holidays
+
+    dates = tuple(sorted(schedule))
+    games = tuple(tuple(schedule[d]) for d in dates)
+    kr_holidays = holidays.KR(years=opening_date.year)
+    rng = random.Random(seed)
+    game_times = game_times or {}
+
+    def time_for(d, g):
+        if g == ('올스타', '올스타'):
+            return ""
+        return game_times.get((d,) + g) or get_game_time(d, kr_holidays, rng)
+    return ScheduleView(
+        dates=dates,
+        daynums=tuple((d - opening_date).days + 1 for d in dates),
+        games=games,
+        months=tuple(sorted(set((d.year, d.month) for d in dates))),
+        times=tuple(tuple(time_for(d, g) for g in day_games) for d, day_games in zip(dates, games)),
+    )
+
+### 콘솔 출력: 날짜별 경기 목록
+def print_schedule(schedule, opening_date=None, view=None):
+    if view is None:
+        view = prepare_schedule_view(schedule, opening_date or min(schedule))
+
+    # 여러 출력기가 동시에 돌 때 줄이 섞이지 않도록 한 번에 출력
+    lines = ["\n✅ 최종 생성된 일정:"]
+    for d, games in zip(view.dates, view.games):
+        lines.append(f"\n{d.strftime('%Y-%m-%d')} ({'월화수목금토일'[d.weekday()]}):")
+        for g in games:
+            if g == ('올스타', '올스타'):
+                lines.append("  🌟 올스타전")
+            else:
+                h, a = g
+                lines.append(f"  vs 팀 {a+1} @ 팀 {h+1}")
+    print("\n".join(lines))
+
 ### HTML 시각화: 간단한 vs 2 @ 1 포맷, 색상 추가
 import hashlib
 import calendar
 from datetime import date
 
 
-def save_schedule_to_html(schedule, opening_date, num_teams):
+def save_schedule_to_html(schedule, opening_date, num_teams, view=None, file_path=None):
     import os
     import hashlib
     import calendar
     from datetime import date
 
-    desktop = os.path.join(os.path.expanduser("~"), "Desktop")
-    file_path = os.path.join(desktop, "calendar_schedule.html")
+    if file_path is None:
+        desktop = os.path.join(os.path.expanduser("~"), "Desktop")
+        file_path = os.path.join(desktop, "calendar_schedule.html")
+    if view is None:
+        view = prepare_schedule_view(schedule, opening_date)
+    games_by_date = dict(zip(view.dates, view.games))
 
     html = """<html><head><meta charset="UTF-8"><title>경기 일정 달력</title>
     <style>
@@ -387,8 +645,7 @@ def save_schedule_to_html(schedule, opening_date, num_teams):
         return f"#{hex_code}"
 
     cal = calendar.HTMLCalendar(calendar.SUNDAY)
-    months = sorted(set((d.year, d.month) for d in schedule))
-    for year, month in months:
+    for year, month in view.months:
         html += f"<h2>{year}년 {month}월</h2><table><tr>"
         headers = ['일', '월', '화', '수', '목', '금', '토']
         html += ''.join(f"<th>{h}</th>" for h in headers) + "</tr>"
@@ -401,7 +658,7 @@ def save_schedule_to_html(schedule, opening_date, num_teams):
                     continue
                 this_date = date(year, month, day)
                 html += f"<td><strong>{day}</strong><br>"
-                for g in schedule.get(this_date, []):
+                for g in games_by_date.get(this_date, ()):
                     if g == ('올스타', '올스타'):
                         html += '<div class="game allstar" data-home="all" data-away="all">🌟 올스타전</div>'
                     else:
@@ -418,6 +675,25 @@ def save_schedule_to_html(schedule, opening_date, num_teams):
         f.write(html)
 
     print(f"\n📅 최종 달력 저장 완료: {file_path}")
+    return file_path
+
+### 경기 시작 시간: 공휴일/주말 1700, 평일 1830, 봄/가을 주말은 50% 확률로 1400
+def get_game_time(game_date, kr_holidays, rng=None):
+    weekday = game_date.weekday()
+    month = game_date.month
+
+    # ✅ 시간 배정 로직
+    if game_date in kr_holidays:
+        time = "1700"
+    elif weekday in (5, 6):  # 토/일
+        time = "1700"
+    else:
+        time = "1830"
+
+    # ✅ 봄/가을 1700인 날 → 50% 확률로 1400
+    if time == "1700" and not (6 <= month <= 8) and game_date not in kr_holidays:
+        time = (rng or random).choice(["1400", "1700"])
+    return time
 
 def export_schedule_to_ootp_xml(
     schedule,
@@ -427,29 +703,28 @@ def export_schedule_to_ootp_xml(
     schedule_type="CUSTOM",
     inter_league="1",
     balanced_games="0",
-    filename="ootp_schedule.lsdl"
+    filename="ootp_schedule.lsdl",
+    view=None
 ):
-    import random
     from xml.etree.ElementTree import Element, SubElement, tostring
     import xml.dom.minidom
-    import holidays
 
     # ✅ OOTP 요일 변환: 월=0 → 2, ..., 토=5 → 7, 일=6 → 1
     start_dow = (opening_date.weekday() + 2) % 7 or 7
 
-    # ✅ allstar_game_day 계산
-    allstar_day_num = (allstar_sat - opening_date).days + 1
+    # ✅ allstar_game_day 계산 (불러온 파일에 올스타전이 없으면 생략)
+    allstar_day_num = (allstar_sat - opening_date).days + 1 if allstar_sat else None
+
+    if view is None:
+        view = prepare_schedule_view(schedule, opening_date)
 
     # ✅ 팀당 경기 수 계산
     total_games = sum(
-        len(games) for d, games in schedule.items()
+        len(games) for games in view.games
         if games and games[0] != ('올스타', '올스타')
     )
     games_per_team = total_games * 2 // num_teams
 
-    # ✅ 공휴일 목록 생성 (대한민국)
-    kr_holidays = holidays.KR(years=opening_date.year)
-
     # ✅ XML 루트 생성
     root = Element("SCHEDULE", {
         "type": schedule_type,
@@ -459,35 +734,19 @@ def export_schedule_to_ootp_xml(
         "start_month": str(opening_date.month),
         "start_day": str(opening_date.day),
         "start_day_of_week": str(start_dow),
-        "allstar_game_day": str(allstar_day_num)
     })
+    if allstar_day_num is not None:
+        root.set("allstar_game_day", str(allstar_day_num))
 
     games_tag = SubElement(root, "GAMES")
 
-    all_dates = sorted(schedule.keys())
-    date_to_daynum = {d: (d - opening_date).days + 1 for d in all_dates}
-
-    for game_date in all_dates:
-        daynum = date_to_daynum[game_date]
-        for game in schedule[game_date]:
+    # ✅ 경기 시작 시간은 공용 뷰에서 읽음 (다른 출력 파일과 같은 시간)
+    for daynum, games, times in zip(view.daynums, view.games, view.times):
+        for game, time in zip(games, times):
             if game == ('올스타', '올스타'):
                 continue
 
             home, away = game
-            weekday = game_date.weekday()
-            month = game_date.month
-
-            # ✅ 시간 배정 로직
-            if game_date in kr_holidays:
-                time = "1700"
-            elif weekday in (5, 6):  # 토/일
-                time = "1700"
-            else:
-                time = "1830"
-
-            # ✅ 봄/가을 1700인 날 → 50% 확률로 1400
-            if time == "1700" and not (6 <= month <= 8) and game_date not in kr_holidays:
-                time = random.choice(["1400", "1700"])
 
             SubElement(games_tag, "GAME", {
                 "day": str(daynum),
@@ -504,86 +763,509 @@ def export_schedule_to_ootp_xml(
         f.write(pretty_xml)
 
     print(f"\n📤 OOTP XML 스케줄 저장 완료: {filename}")
+    return filename
+
+### LSDL 불러오기: iterparse로 GAME 태그를 하나씩 읽고 바로 해제 (대용량 파일도 메모리 일정)
+def get_allstar_week_n(allstar_sat):
+    # 올스타 토요일이 7월 몇 번째 올스타 주간인지 역산 (해당 없으면 None)
+    if allstar_sat.month != 7:
+        return None
+    week_n = 1
+    while True:
+        try:
+            fri, sat, sun = get_allstar_dates(allstar_sat.year, week_n)
+        except ValueError:
+            return None
+        if sat == allstar_sat:
+            return week_n
+        week_n += 1
+
+def infer_season_year(start_month, start_day, start_day_of_week, latest_year=None):
+    # LSDL에는 연도가 없으므로 개막 요일(OOTP 형식: 일=1 ... 토=7)이 맞는 가장 최근 연도를 찾음
+    year = latest_year or date.today().year
+    for y in range(year, year - 28, -1):
+        d = date(y, start_month, start_day)
+        if ((d.weekday() + 2) % 7 or 7) == start_day_of_week:
+            return y
+    raise ValueError(f"개막 요일({start_day_of_week})과 맞는 연도를 찾을 수 없습니다.")
+
+def load_schedule_from_ootp_xml(filename, year=None):
+    from xml.etree.ElementTree import iterparse
 
-def main():
-    # 사용자 입력 받기
-    num_teams, opening_date, games_between_teams, allstar_week_n = get_user_input()
-
-    # 올스타 날짜 계산
-    allstar_fri, allstar_sat, allstar_sun = get_allstar_dates(opening_date.year, allstar_week_n)
-
-    # 팀 조합 및 시리즈 생성
-    teams = list(range(num_teams))
-    pairings = list(itertools.combinations(teams, 2))
-    all_series = []
-    for home, away in pairings:
-        home_games = games_between_teams // 2
-        away_games = games_between_teams - home_games
-        for l in generate_series(home_games):
-            all_series.append({'home': home, 'away': away, 'length': l})
-        for l in generate_series(away_games):
-            all_series.append({'home': away, 'away': home, 'length': l})
+    schedule = {}
+    game_times = {}
+    num_teams = 0
+
+    context = iterparse(filename, events=("start", "end"))
+    _, root = next(context)
+    if root.tag != "SCHEDULE":
+        raise ValueError(f"OOTP 스케줄 파일이 아닙니다: 루트 태그 <{root.tag}>")
+
+    header = dict(root.attrib)
+    year_inferred = False
+    start_month = int(header["start_month"])
+    start_day = int(header["start_day"])
+    if "start_day_of_week" in header:
+        start_dow = int(header["start_day_of_week"])
+        if year is None:
+            year = infer_season_year(start_month, start_day, start_dow)
+            year_inferred = True
+        else:
+            expected = (date(year, start_month, start_day).weekday() + 2) % 7 or 7
+            if expected != start_dow:
+                raise ValueError(f"{year}년 {start_month}월 {start_day}일은 start_day_of_week={start_dow}와 요일이 맞지 않습니다.")
+    elif year is None:
+        raise ValueError("start_day_of_week가 없는 파일은 연도를 직접 지정해야 합니다.")
+    opening_date = date(year, start_month, start_day)
+
+    parent = root
+    for event, elem in context:
+        if event == "start":
+            if elem.tag == "GAMES":
+                parent = elem
+            continue
+        if elem.tag == "GAME":
+            day = int(elem.get("day"))
+            home = int(elem.get("home")) - 1
+            away = int(elem.get("away")) - 1
+            game_date = opening_date + timedelta(days=day - 1)
+            schedule.setdefault(game_date, []).append((home, away))
+            if elem.get("time"):
+                game_times[(game_date, home, away)] = elem.get("time")
+            num_teams = max(num_teams, home + 1, away + 1)
+            # 처리한 태그는 즉시 제거해서 트리가 커지지 않게 함
+            parent.clear()
+
+    allstar_sat = None
+    allstar_week_n = None
+    if "allstar_game_day" in header:
+        allstar_sat = opening_date + timedelta(days=int(header["allstar_game_day"]) - 1)
+        allstar_week_n = get_allstar_week_n(allstar_sat)
+        schedule.setdefault(allstar_sat, []).append(('올스타', '올스타'))
+
+    info = {
+        "type": header.get("type", "CUSTOM"),
+        "inter_league": header.get("inter_league", "1"),
+        "balanced_games": header.get("balanced_games", "0"),
+        "games_per_team": int(header["games_per_team"]) if "games_per_team" in header else None,
+        "start_day_of_week": int(header["start_day_of_week"]) if "start_day_of_week" in header else None,
+        "allstar_game_day": int(header["allstar_game_day"]) if "allstar_game_day" in header else None,
+        "opening_date": opening_date,
+        "allstar_sat": allstar_sat,
+        "allstar_week_n": allstar_week_n,
+        "num_teams": num_teams,
+        "year": year,
+        "year_inferred": year_inferred,
+        "game_times": game_times,  # {(날짜, 홈, 원정): "HHMM"} → 다시 내보낼 때 원래 시간 유지
+    }
 
-    # 사용 가능한 날짜 계산
-    total_game_days = sum(s['length'] for s in all_series)
-    date_buffer = 20
-    available_dates = get_available_dates(
-        opening_date, allstar_fri, allstar_sat, allstar_sun, total_game_days + date_buffer
-    )
+    print(f"\n📥 OOTP XML 스케줄 불러오기 완료: {filename} ({len(schedule)}일, {num_teams}팀, {year}년)")
+    if year_inferred:
+        # 개막 요일이 같은 연도는 여러 개 → 가장 최근 연도를 고른 것이므로 과거 시즌이면 연도를 직접 지정해야 함
+        print(f"⚠️ 파일에 연도가 없어 개막 요일로 {year}년을 추정했습니다. 다른 시즌이면 --year로 지정하세요 "
+              f"(공휴일 경기 시간과 올스타 주간이 연도에 따라 달라집니다).")
+    return schedule, info
 
-    # 스케줄 생성
-    schedule = generate_schedule(
-        num_teams,
-        opening_date,
-        games_between_teams,
-        allstar_week_n,
-        available_dates
-    )
+### 일정 검증: 팀 중복 배정, 월요일 경기, 팀당 경기 수 불일치 등을 문제 목록으로 반환
+# allow_monday=True면 월요일 경기(우천 취소 재배정 등)는 문제로 보지 않음
+def validate_schedule(schedule, num_teams, games_per_team=None, allstar_sat=None, allow_monday=False):
+    problems = []
+    team_games = [0] * num_teams
 
-    # stretch 적용 여부
-    use_stretch = input("경기 일정을 최소 170일로 늘리는 stretch 기능을 사용할까요? (Y/N): ").strip().lower() == 'y'
-    if use_stretch:
-        print("\n🔧 stretch 기능 적용 중...")
-        schedule = stretch_schedule(schedule, opening_date, 170, allstar_week_n)
-    else:
-        print("\n✅ stretch 미적용, 가능한 한 촘촘히 배정합니다.")
-        rest_days = [d for d in sorted(schedule)
-                     if d.weekday() != 0 and d not in {allstar_fri, allstar_sat, allstar_sun}
-                     and not schedule[d]]
-        if rest_days:
-            print(f"⚠️ 경기 없는 날이 {len(rest_days)}일 있습니다: 예시 → {[d.strftime('%Y-%m-%d') for d in rest_days[:3]]}")
-        else:
-            print("🎉 경기 없는 날 없이 촘촘하게 구성됐습니다.")
+    for d in sorted(schedule):
+        seen = set()
+        for g in schedule[d]:
+            if g == ('올스타', '올스타'):
+                if allstar_sat is not None and d != allstar_sat:
+                    problems.append(f"{d}: 올스타전 날짜가 {allstar_sat}와 다릅니다.")
+                continue
+            home, away = g
+            if home == away:
+                problems.append(f"{d}: 팀 {home+1}이 자기 자신과 경기합니다.")
+            for t in (home, away):
+                if not 0 <= t < num_teams:
+                    problems.append(f"{d}: 존재하지 않는 팀 번호 {t+1}")
+                    continue
+                if t in seen:
+                    problems.append(f"{d}: 팀 {t+1}이 하루에 두 경기 이상 배정됐습니다.")
+                seen.add(t)
+                team_games[t] += 1
+        if seen and d.weekday() == 0 and not allow_monday:
+            problems.append(f"{d}: 월요일에 경기가 있습니다.")
+
+    if games_per_team is not None:
+        for t, n in enumerate(team_games):
+            if n != games_per_team:
+                problems.append(f"팀 {t+1}: {n}경기 (기대값 {games_per_team}경기)")
+
+    return problems
+
+### 일정 비교: (홈, 원정, n번째 시리즈) 키로 해시 인덱스를 만들어 두 일정을 한 번씩만 훑음
+def extract_series(schedule):
+    # 같은 홈/원정 조합이 연속된 날짜에 이어지면 한 시리즈로 묶음
+    series = {}
+    open_runs = {}   # (홈, 원정) -> [시작일, 마지막 날짜, 경기 수]
+    counts = {}      # (홈, 원정) -> 지금까지 나온 시리즈 수
 
-    # 일정 콘솔 출력
-    print("\n✅ 최종 생성된 일정:")
     for d in sorted(schedule):
-        print(f"\n{d.strftime('%Y-%m-%d')} ({'월화수목금토일'[d.weekday()]}):")
         for g in schedule[d]:
             if g == ('올스타', '올스타'):
-                print("  🌟 올스타전")
+                continue
+            run = open_runs.get(g)
+            if run is not None and (d - run[1]).days == 1:
+                run[1] = d
+                run[2] += 1
+                continue
+            n = counts.get(g, 0) + 1
+            counts[g] = n
+            run = [d, d, 1]
+            open_runs[g] = run
+            series[(g[0], g[1], n)] = run
+
+    return {key: (run[0], run[2]) for key, run in series.items()}
+
+def get_season_span(schedule):
+    game_dates = [d for d, games in schedule.items()
+                  if any(g != ('올스타', '올스타') for g in games)]
+    if not game_dates:
+        return None, None, 0
+    first_day, last_day = min(game_dates), max(game_dates)
+    return first_day, last_day, (last_day - first_day).days + 1
+
+def diff_schedules(old, new, year=None):
+    # 파일 경로가 들어오면 LSDL 리더로 불러옴
+    if isinstance(old, str):
+        old, _ = load_schedule_from_ootp_xml(old, year)
+    if isinstance(new, str):
+        new, _ = load_schedule_from_ootp_xml(new, year)
+
+    old_series = extract_series(old)
+    new_series = extract_series(new)
+
+    moved = []
+    for key in old_series.keys() & new_series.keys():
+        if old_series[key] != new_series[key]:
+            moved.append((key, old_series[key], new_series[key]))
+    removed = [(key, old_series[key]) for key in old_series.keys() - new_series.keys()]
+    added = [(key, new_series[key]) for key in new_series.keys() - old_series.keys()]
+
+    # 팀 조합별 홈 경기 수 비교 (홈/원정이 바뀐 조합 찾기)
+    def home_counts(series):
+        result = {}
+        for (home, away, _), (_, length) in series.items():
+            result[(home, away)] = result.get((home, away), 0) + length
+        return result
+
+    old_home = home_counts(old_series)
+    new_home = home_counts(new_series)
+    home_away_changed = []
+    for pair in sorted({tuple(sorted(p)) for p in old_home.keys() | new_home.keys()}):
+        a, b = pair
+        before = (old_home.get((a, b), 0), old_home.get((b, a), 0))
+        after = (new_home.get((a, b), 0), new_home.get((b, a), 0))
+        if before != after:
+            home_away_changed.append((pair, before, after))
+
+    old_first, old_last, old_span = get_season_span(old)
+    new_first, new_last, new_span = get_season_span(new)
+
+    return {
+        "moved": sorted(moved),
+        "added": sorted(added),
+        "removed": sorted(removed),
+        "home_away_changed": home_away_changed,
+        "season": {
+            "old": (old_first, old_last, old_span),
+            "new": (new_first, new_last, new_span),
+            "span_change": new_span - old_span,
+        },
+    }
+
+def format_schedule_diff(diff, as_json=False):
+    if as_json:
+        import json
+
+        def series_entry(key, value):
+            (home, away, n), (start, length) = key, value
+            return {"home": home + 1, "away": away + 1, "series": n,
+                    "start": start.isoformat(), "length": length}
+
+        def span_entry(span):
+            first_day, last_day, days = span
+            return {"first": first_day.isoformat() if first_day else None,
+                    "last": last_day.isoformat() if last_day else None,
+                    "days": days}
+
+        return json.dumps({
+            "moved": [
+                {**series_entry(key, new), "old_start": old[0].isoformat(), "old_length": old[1]}
+                for key, old, new in diff["moved"]
+            ],
+            "added": [series_entry(key, value) for key, value in diff["added"]],
+            "removed": [series_entry(key, value) for key, value in diff["removed"]],
+            "home_away_changed": [
+                {"teams": [a + 1, b + 1], "old_home_games": list(before), "new_home_games": list(after)}
+                for (a, b), before, after in diff["home_away_changed"]
+            ],
+            "season": {
+                "old": span_entry(diff["season"]["old"]),
+                "new": span_entry(diff["season"]["new"]),
+                "span_change": diff["season"]["span_change"],
+            },
+        }, ensure_ascii=False, indent=2)
+
+    lines = []
+    season = diff["season"]
+    lines.append(f"📏 시즌 기간: {season['old'][2]}일 → {season['new'][2]}일 ({season['span_change']:+d}일)")
+    lines.append(f"🔀 이동 {len(diff['moved'])} / ➕ 추가 {len(diff['added'])} / ➖ 삭제 {len(diff['removed'])} 시리즈")
+    for (home, away, n), (old_start, old_len), (new_start, new_len) in diff["moved"]:
+        lines.append(f"  ~ 팀 {away+1} @ 팀 {home+1} #{n}: {old_start} ({old_len}연전) → {new_start} ({new_len}연전)")
+    for (home, away, n), (start, length) in diff["added"]:
+        lines.append(f"  + 팀 {away+1} @ 팀 {home+1} #{n}: {start} ({length}연전)")
+    for (home, away, n), (start, length) in diff["removed"]:
+        lines.append(f"  - 팀 {away+1} @ 팀 {home+1} #{n}: {start} ({length}연전)")
+    for (a, b), before, after in diff["home_away_changed"]:
+        lines.append(f"  ⇄ 팀 {a+1} vs 팀 {b+1} 홈 경기 수: {before[0]}:{before[1]} → {after[0]}:{after[1]}")
+    return "\n".join(lines)
+
+### 분석용 컬럼 파일(.oksc): 32바이트 헤더 + 고정 폭 정수 컬럼 (series u32, day/home/away/time u16)
+# 리틀 엔디언 고정. 불러올 때는 mmap으로 열어서 파싱 없이 컬럼을 그대로 memoryview로 봄
+COLUMNAR_MAGIC = b"OKSC"
+COLUMNAR_VERSION = 1
+COLUMNAR_HEADER = "<4sHHHBBHIH12x"  # magic, version, num_teams, year, month, day, allstar_game_day, games, games_per_team
+
+def export_schedule_to_columnar(schedule, opening_date, num_teams, allstar_sat, filename="ootp_schedule.oksc",
+                                view=None):
+    import sys
+    import struct
+    from array import array
+
+    if view is None:
+        view = prepare_schedule_view(schedule, opening_date)
+
+    series_col = array("I")
+    day_col = array("H")
+    home_col = array("H")
+    away_col = array("H")
+    time_col = array("H")
+
+    # 같은 홈/원정 조합이 연속된 날짜에 이어지면 같은 시리즈 번호 (extract_series와 같은 기준)
+    open_runs = {}
+    next_series_id = 0
+    for game_date, daynum, games, times in zip(view.dates, view.daynums, view.games, view.times):
+        for game, time in zip(games, times):
+            if game == ('올스타', '올스타'):
+                continue
+            run = open_runs.get(game)
+            if run is not None and (game_date - run[0]).days == 1:
+                run[0] = game_date
             else:
-                h, a = g
-                print(f"  vs 팀 {a+1} @ 팀 {h+1}")
-
-    # HTML 시각화 저장
-    save_schedule_to_html(schedule, opening_date, num_teams)
-
-    # OOTP XML 속성 입력
-    schedule_type, inter_league, balanced_games = get_ootp_header_input()
-
-    # OOTP XML 저장
-    export_schedule_to_ootp_xml(
-        schedule,
-        opening_date,
-        num_teams,
-        allstar_sat,
-        schedule_type=schedule_type,
-        inter_league=inter_league,
-        balanced_games=balanced_games,
-        filename="ootp_schedule.lsdl"
+                run = [game_date, next_series_id]
+                open_runs[game] = run
+                next_series_id += 1
+            series_col.append(run[1])
+            day_col.append(daynum)
+            home_col.append(game[0] + 1)
+            away_col.append(game[1] + 1)
+            time_col.append(int(time))  # LSDL과 같은 시간 (공용 뷰에서 읽음)
+
+    game_count = len(day_col)
+    games_per_team = game_count * 2 // num_teams if num_teams else 0
+    allstar_day_num = (allstar_sat - opening_date).days + 1 if allstar_sat else 0
+    header = struct.pack(
+        COLUMNAR_HEADER, COLUMNAR_MAGIC, COLUMNAR_VERSION, num_teams,
+        opening_date.year, opening_date.month, opening_date.day,
+        allstar_day_num, game_count, games_per_team
     )
 
+    with open(filename, "wb") as f:
+        f.write(header)
+        for col in (series_col, day_col, home_col, away_col, time_col):
+            if sys.byteorder == "big":
+                col.byteswap()
+            col.tofile(f)
+
+    print(f"\n📦 컬럼 스케줄 저장 완료: {filename} ({game_count}경기)")
+    return filename
+
+### 내보내기 단계: 공용 뷰를 한 번 만들고 요청된 출력기를 스레드 풀에서 동시에 실행
+def run_export_stage(schedule, opening_date, num_teams, allstar_sat, console=False, html=False, html_path=None,
+                     lsdl_path=None, columnar_path=None, schedule_type="CUSTOM", inter_league="1",
+                     balanced_games="0", max_workers=None, seed=0, game_times=None):
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    stage_start = time.perf_counter()
+    # 경기 시간까지 여기서 한 번만 정함 → 모든 출력 파일이 같은 시간을 씀 (game_times에 있는 경기는 그 시간 유지)
+    view = prepare_schedule_view(schedule, opening_date, seed, game_times)
+
+    jobs = {}
+    if console:
+        jobs["console"] = lambda: print_schedule(schedule, opening_date, view=view)
+    if html:
+        # html_path가 없으면 기본 위치(바탕화면)에 저장
+        jobs["html"] = lambda: save_schedule_to_html(schedule, opening_date, num_teams, view=view, file_path=html_path)
+    if lsdl_path is not None:
+        jobs["lsdl"] = lambda: export_schedule_to_ootp_xml(
+            schedule, opening_date, num_teams, allstar_sat,
+            schedule_type=schedule_type, inter_league=inter_league, balanced_games=balanced_games,
+            filename=lsdl_path, view=view
+        )
+    if columnar_path is not None:
+        jobs["columnar"] = lambda: export_schedule_to_columnar(
+            schedule, opening_date, num_teams, allstar_sat, columnar_path, view=view
+        )
+
+    def timed(job):
+        start = time.perf_counter()
+        try:
+            return job(), time.perf_counter() - start, None
+        except Exception as e:
+            return None, time.perf_counter() - start, e
+
+    outputs = {}
+    with ThreadPoolExecutor(max_workers=max_workers or max(len(jobs), 1)) as pool:
+        futures = {name: pool.submit(timed, job) for name, job in jobs.items()}
+        for name, future in futures.items():
+            path, seconds, error = future.result()
+            outputs[name] = {"path": path, "seconds": seconds, "error": error}
+
+    return {
+        "outputs": outputs,
+        "seconds": time.perf_counter() - stage_start,
+        "errors": {name: out["error"] for name, out in outputs.items() if out["error"] is not None},
+    }
+
+class ColumnarSchedule:
+    def __init__(self, filename):
+        self.filename = filename
+        self._mmap = None
+        self._file = open(filename, "rb")
+        try:
+            self._load()
+        except BaseException:
+            # 잘못된 파일이면 어느 단계에서 실패하든 파일과 mmap을 닫고 예외를 그대로 올림
+            self.close()
+            raise
+
+    def _load(self):
+        import os
+        import sys
+        import mmap
+        import struct
+
+        filename = self.filename
+        header_size = struct.calcsize(COLUMNAR_HEADER)
+        file_size = os.fstat(self._file.fileno()).st_size
+        if file_size < header_size:
+            raise ValueError(f"컬럼 스케줄 파일이 헤더({header_size}바이트)보다 짧습니다: {filename}")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, self.num_teams, year, month, day,
+         self.allstar_game_day, self.game_count, self.games_per_team) = struct.unpack_from(COLUMNAR_HEADER, self._mmap)
+        if magic != COLUMNAR_MAGIC:
+            raise ValueError(f"컬럼 스케줄 파일이 아닙니다: {filename}")
+        if version != COLUMNAR_VERSION:
+            raise ValueError(f"지원하지 않는 컬럼 파일 버전입니다: {version}")
+        # 경기당 12바이트 (series u32 + day/home/away/time u16)
+        expected_size = header_size + self.game_count * 12
+        if len(self._mmap) < expected_size:
+            raise ValueError(f"컬럼 스케줄 파일이 잘렸습니다: {len(self._mmap)}바이트 (필요 {expected_size}바이트)")
+        try:
+            self.opening_date = date(year, month, day)
+        except ValueError:
+            raise ValueError(f"컬럼 스케줄 파일의 개막일이 잘못됐습니다: {year}-{month}-{day}") from None
+
+        n = self.game_count
+        view = memoryview(self._mmap)
+        offset = header_size
+        columns = {}
+        for name, code, width in (("series", "I", 4), ("day", "H", 2), ("home", "H", 2),
+                                  ("away", "H", 2), ("time", "H", 2)):
+            raw = view[offset:offset + n * width]
+            if sys.byteorder == "big":
+                from array import array
+                col = array(code)
+                col.frombytes(raw)
+                col.byteswap()
+                columns[name] = col
+            else:
+                columns[name] = raw.cast(code)
+            offset += n * width
+        self.series = columns["series"]
+        self.day = columns["day"]
+        self.home = columns["home"]
+        self.away = columns["away"]
+        self.time = columns["time"]
+
+    def __len__(self):
+        return self.game_count
+
+    def to_schedule(self):
+        # 기존 {날짜: [(홈, 원정), ...]} 구조로 변환 (0부터 시작하는 팀 번호, 올스타 포함)
+        schedule = {}
+        opening_date = self.opening_date
+        for day, home, away in zip(self.day, self.home, self.away):
+            game_date = opening_date + timedelta(days=day - 1)
+            schedule.setdefault(game_date, []).append((home - 1, away - 1))
+        if self.allstar_game_day:
+            allstar_sat = opening_date + timedelta(days=self.allstar_game_day - 1)
+            schedule.setdefault(allstar_sat, []).append(('올스타', '올스타'))
+        return schedule
+
+    def close(self):
+        # 컬럼은 mmap을 그대로 보는 memoryview라서, 호출한 쪽이 슬라이스(c.day[0:5] 등)를 아직 들고 있으면
+        # mmap을 바로 닫을 수 없음 → 그 경우 파일만 닫고 mmap은 슬라이스가 사라질 때 함께 해제됨
+        # (닫은 뒤에도 값이 필요하면 list(c.day[0:5])처럼 복사해서 쓸 것)
+        for name in ("series", "day", "home", "away", "time"):
+            col = getattr(self, name, None)
+            if isinstance(col, memoryview):
+                col.release()
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass
+            self._mmap = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def load_columnar_schedule(filename):
+    return ColumnarSchedule(filename)
+
+### 불러오기 모드: 기존 LSDL → 검증 → (선택) stretch → 다시 내보내기 (헤더 속성은 원본 그대로)
+def reexport_loaded_schedule(filename, year=None, use_stretch=False, min_span=170,
+                             lsdl_path="ootp_schedule.lsdl", html=False):
+    schedule, info = load_schedule_from_ootp_xml(filename, year)
+    num_teams = info["num_teams"]
+    opening_date = info["opening_date"]
+
+    problems = validate_schedule(schedule, num_teams, info["games_per_team"], info["allstar_sat"])
+    if problems:
+        print(f"\n⚠️ 검증 문제 {len(problems)}건:")
+        for p in problems[:20]:
+            print(f"  - {p}")
+    else:
+        print("\n✅ 검증 통과")
+
+    if use_stretch:
+        if info["allstar_week_n"] is None:
+            raise ValueError("올스타 주간을 알 수 없는 파일은 stretch할 수 없습니다.")
+        schedule = stretch_schedule(schedule, opening_date, min_span, info["allstar_week_n"])
+
+    # 원래 파일의 경기 시간을 그대로 씀 (stretch로 날짜가 바뀐 경기만 새 날짜 기준으로 다시 정함)
+    result = run_export_stage(
+        schedule, opening_date, num_teams, info["allstar_sat"], html=html, lsdl_path=lsdl_path,
+        schedule_type=info["type"], inter_league=info["inter_league"], balanced_games=info["balanced_games"],
+        game_times=info["game_times"]
+    )
+    return schedule, problems, result
+
 def generate_type_attribute(games_per_team, structure, num_teams):
     if len(structure) == 1:
         prefix = "ILN"
@@ -599,7 +1281,3 @@ def generate_type_attribute(games_per_team, structure, num_teams):
 
     return f"{prefix}_BGN_G{games_per_team * (num_teams - 1)}_" + ''.join(parts)
 
-
-
-if __name__ == '__main__':
-    main()
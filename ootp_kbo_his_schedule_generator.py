@@ -1,24 +1,53 @@
 import sys
 import os
-import itertools
+import random
+import calendar
 from functools import partial
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QLabel, QPushButton, QSpinBox, QVBoxLayout, QCalendarWidget,
-    QComboBox, QFileDialog, QMessageBox, QCheckBox, QGridLayout, QGroupBox, QScrollArea
+    QComboBox, QFileDialog, QMessageBox, QCheckBox, QGridLayout, QGroupBox, QScrollArea,
+    QHBoxLayout, QTableWidget, QTableWidgetItem, QHeaderView
 )
-from PyQt5.QtCore import QDate, Qt
+from PyQt5.QtCore import QDate, Qt, QTimer, QThread, pyqtSignal
 from PyQt5.QtGui import QPixmap
 
-from baseball_scheduler import (
-    get_allstar_dates,
-    get_available_dates,
-    generate_schedule,
-    stretch_schedule,
-    save_schedule_to_html,
-    export_schedule_to_ootp_xml,
-    generate_type_attribute,
-    generate_series,
-)
+from baseball_scheduler import generate_type_attribute
+from schedule_cache import ScheduleCache
+from schedule_pipeline import SchedulePipeline
+
+
+### 같은 설정의 파이프라인 객체를 재사용 (미리보기와 저장이 같은 배정 결과를 씀)
+def get_stage_pipeline(stage_cache, structure, opening_date, games_between_teams, allstar_week_n, seed):
+    key = (tuple(map(tuple, structure)), opening_date, games_between_teams, allstar_week_n, seed)
+    pipeline = stage_cache.get(key)
+    if pipeline is None:
+        pipeline = SchedulePipeline(structure, opening_date, games_between_teams, allstar_week_n, seed=seed)
+        stage_cache[key] = pipeline
+    return pipeline
+
+
+### 미리보기용 백그라운드 생성: 파이프라인 객체를 기억해서 바뀐 단계만 다시 계산
+class PreviewWorker(QThread):
+    result_ready = pyqtSignal(int, object, object, str)
+
+    def __init__(self, request_id, params, stage_cache, parent=None):
+        super().__init__(parent)
+        self.request_id = request_id
+        self.params = params
+        self.stage_cache = stage_cache
+
+    def run(self):
+        try:
+            structure, opening_date, games_between_teams, allstar_week_n, use_stretch, seed = self.params
+
+            # 같은 설정의 파이프라인을 재사용 → stretch만 바뀌면 배정 단계는 다시 하지 않음
+            pipeline = get_stage_pipeline(self.stage_cache, structure, opening_date, games_between_teams,
+                                          allstar_week_n, seed)
+
+            schedule = pipeline.season(use_stretch, 170)
+            self.result_ready.emit(self.request_id, schedule, pipeline.gap(schedule), "")
+        except Exception as e:
+            self.result_ready.emit(self.request_id, None, None, str(e))
 
 
 class SchedulerGUI(QWidget):
@@ -118,6 +147,13 @@ class SchedulerGUI(QWidget):
         self.allstar_week_input.setMaximum(5)
         self.allstar_week_input.setValue(2)
 
+        self.seed_input = QSpinBox()
+        self.seed_input.setMinimum(0)
+        self.seed_input.setMaximum(999999)
+        self.seed_input.setValue(random.randint(0, 999999))  # 실행할 때마다 새 일정, 시드는 화면에 표시
+        self.seed_roll_button = QPushButton("🎲 새 시드")
+        self.seed_roll_button.clicked.connect(lambda: self.seed_input.setValue(random.randint(0, 999999)))
+
         self.calendar = QCalendarWidget()
         self.calendar.setGridVisible(True)
         self.calendar.clicked.connect(self.check_saturday)
@@ -154,21 +190,30 @@ class SchedulerGUI(QWidget):
         self.stretch_check = QCheckBox("170일 stretch 사용(시즌 총 길이가 170일 미만 일 시 휴식일을 삽입하여 170일 이상으로 만듭니다.)")
         self.inter_league_check = QCheckBox("인터리그")
         self.balanced_check = QCheckBox("균형 잡힌 스케줄")
+        self.columnar_check = QCheckBox("분석용 컬럼 파일(.oksc)도 함께 저장")
 
         main_layout.addWidget(QLabel("팀 간 게임 수"))
         main_layout.addWidget(self.games_input)
         main_layout.addWidget(QLabel("올스타 주간 (7월 n째 주)"))
         main_layout.addWidget(self.allstar_week_input)
+        main_layout.addWidget(QLabel("랜덤 시드 (같은 설정 + 같은 시드면 저장된 일정을 바로 불러옵니다)"))
+        seed_layout = QHBoxLayout()
+        seed_layout.addWidget(self.seed_input)
+        seed_layout.addWidget(self.seed_roll_button)
+        main_layout.addLayout(seed_layout)
         main_layout.addWidget(QLabel("개막일 선택"))
         main_layout.addWidget(self.calendar)
         main_layout.addWidget(self.stretch_check)
         main_layout.addWidget(self.inter_league_check)
         main_layout.addWidget(self.balanced_check)
+        main_layout.addWidget(self.columnar_check)
 
         self.save_button = QPushButton("스케줄 생성 및 저장")
         self.save_button.clicked.connect(self.generate_and_save)  # 연결 유지
         main_layout.addWidget(self.save_button)
 
+        main_layout.addWidget(self.build_preview_group())
+
         scroll.setWidget(container)
         layout = QVBoxLayout(self)
         layout.addWidget(scroll)
@@ -176,6 +221,186 @@ class SchedulerGUI(QWidget):
 
         self.build_structure_inputs()
 
+        self.preset_combo.currentIndexChanged.connect(self.schedule_preview)
+        self.games_input.valueChanged.connect(self.schedule_preview)
+        self.allstar_week_input.valueChanged.connect(self.schedule_preview)
+        self.seed_input.valueChanged.connect(self.schedule_preview)
+        self.calendar.selectionChanged.connect(self.schedule_preview)
+        self.stretch_check.stateChanged.connect(self.schedule_preview)
+        self.schedule_preview()
+
+    def build_preview_group(self):
+        self.preview_schedule = None
+        self.preview_month = None
+        self.preview_months = []
+        self.preview_stage_cache = {}
+        self.preview_request_id = 0
+        self.preview_worker = None
+        self.preview_pending = False
+
+        # 입력이 바뀔 때마다 바로 만들지 않고 잠깐 기다렸다가 마지막 값으로 한 번만 생성
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(400)
+        self.preview_timer.timeout.connect(self.start_preview)
+
+        group = QGroupBox("일정 미리보기")
+        layout = QVBoxLayout()
+
+        nav_layout = QHBoxLayout()
+        self.preview_prev_button = QPushButton("◀")
+        self.preview_prev_button.clicked.connect(lambda: self.move_preview_month(-1))
+        self.preview_month_label = QLabel("")
+        self.preview_month_label.setAlignment(Qt.AlignCenter)
+        self.preview_next_button = QPushButton("▶")
+        self.preview_next_button.clicked.connect(lambda: self.move_preview_month(1))
+        self.preview_team_combo = QComboBox()
+        self.preview_team_combo.addItem("전체 보기", None)
+        self.preview_team_combo.currentIndexChanged.connect(self.render_preview_month)
+        nav_layout.addWidget(self.preview_prev_button)
+        nav_layout.addWidget(self.preview_month_label, 1)
+        nav_layout.addWidget(self.preview_next_button)
+        nav_layout.addWidget(self.preview_team_combo)
+        layout.addLayout(nav_layout)
+
+        self.preview_status_label = QLabel("")
+        layout.addWidget(self.preview_status_label)
+
+        self.preview_table = QTableWidget(6, 7)
+        self.preview_table.setHorizontalHeaderLabels(['일', '월', '화', '수', '목', '금', '토'])
+        self.preview_table.verticalHeader().setVisible(False)
+        self.preview_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.preview_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.preview_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.preview_table.setMinimumHeight(360)
+        layout.addWidget(self.preview_table)
+
+        group.setLayout(layout)
+        return group
+
+    def schedule_preview(self, *args):
+        if hasattr(self, "preview_timer"):
+            self.preview_timer.start()
+
+    def start_preview(self):
+        if self.preview_worker is not None and self.preview_worker.isRunning():
+            self.preview_pending = True  # 끝나면 최신 입력으로 다시 생성
+            return
+
+        structure = self.parse_structure()
+        if not structure:
+            return
+        params = (
+            structure,
+            self.calendar.selectedDate().toPyDate(),
+            self.games_input.value(),
+            self.allstar_week_input.value(),
+            self.stretch_check.isChecked(),
+            self.seed_input.value(),
+        )
+        if len(self.preview_stage_cache) > 32:
+            self.preview_stage_cache.clear()
+
+        self.preview_request_id += 1
+        self.preview_status_label.setText("⏳ 미리보기 생성 중...")
+        self.preview_worker = PreviewWorker(self.preview_request_id, params, self.preview_stage_cache, self)
+        self.preview_worker.result_ready.connect(self.on_preview_ready)
+        self.preview_worker.finished.connect(self.on_preview_worker_finished)
+        self.preview_worker.start()
+
+    def on_preview_worker_finished(self):
+        if self.preview_pending:
+            self.preview_pending = False
+            self.start_preview()
+
+    def on_preview_ready(self, request_id, schedule, gap, error):
+        if request_id != self.preview_request_id or self.preview_pending:
+            return  # 이미 입력이 바뀐 뒤의 오래된 결과
+        if error:
+            self.preview_status_label.setText(f"⚠️ {error}")
+            return
+
+        self.preview_schedule = schedule
+        self.preview_months = sorted(set((d.year, d.month) for d in schedule))
+        if self.preview_month not in self.preview_months:
+            self.preview_month = self.preview_months[0] if self.preview_months else None
+
+        num_teams = sum(sum(division) for division in self.parse_structure())
+        if self.preview_team_combo.count() != num_teams + 1:
+            selected = self.preview_team_combo.currentData()
+            self.preview_team_combo.blockSignals(True)
+            self.preview_team_combo.clear()
+            self.preview_team_combo.addItem("전체 보기", None)
+            for t in range(num_teams):
+                self.preview_team_combo.addItem(f"팀 {t+1}", t)
+            if selected is not None and selected < num_teams:
+                self.preview_team_combo.setCurrentIndex(selected + 1)
+            self.preview_team_combo.blockSignals(False)
+
+        game_dates = [d for d, games in schedule.items() if games and games[0] != ('올스타', '올스타')]
+        if game_dates:
+            span = (max(game_dates) - min(game_dates)).days + 1
+            self.preview_status_label.setText(f"📏 {min(game_dates)} ~ {max(game_dates)} ({span}일)  "
+                                              f"하한 {gap['bound_days']}일, 갭 +{max(0, gap['gap'])}일")
+        self.render_preview_month()
+
+    def move_preview_month(self, step):
+        if self.preview_month not in self.preview_months:
+            return
+        index = self.preview_months.index(self.preview_month) + step
+        if 0 <= index < len(self.preview_months):
+            self.preview_month = self.preview_months[index]
+            self.render_preview_month()
+
+    def render_preview_month(self, *args):
+        # 현재 보이는 달만 그림 (큰 리그에서도 셀 42개만 갱신)
+        self.preview_table.clearContents()
+        if self.preview_schedule is None or self.preview_month is None:
+            self.preview_month_label.setText("")
+            return
+
+        year, month = self.preview_month
+        self.preview_month_label.setText(f"{year}년 {month}월")
+        team = self.preview_team_combo.currentData()
+        index = self.preview_months.index(self.preview_month)
+        self.preview_prev_button.setEnabled(index > 0)
+        self.preview_next_button.setEnabled(index < len(self.preview_months) - 1)
+
+        cal = calendar.Calendar(calendar.SUNDAY)
+        for row, week in enumerate(cal.monthdatescalendar(year, month)):
+            for col, this_date in enumerate(week):
+                if this_date.month != month:
+                    continue
+                lines = [str(this_date.day)]
+                games = self.preview_schedule.get(this_date, [])
+                if team is None:
+                    shown = []
+                    for g in games:
+                        if g == ('올스타', '올스타'):
+                            shown.append("🌟 올스타전")
+                        else:
+                            shown.append(f"{g[0]+1} VS {g[1]+1}")
+                    if len(shown) > 6:
+                        shown = shown[:5] + [f"외 {len(shown) - 5}경기"]
+                    lines.extend(shown)
+                else:
+                    for g in games:
+                        if g == ('올스타', '올스타'):
+                            lines.append("🌟 올스타전")
+                        elif g[0] == team:
+                            lines.append(f"VS{g[1]+1}")
+                        elif g[1] == team:
+                            lines.append(f"@{g[0]+1}")
+                item = QTableWidgetItem("\n".join(lines))
+                item.setTextAlignment(Qt.AlignTop | Qt.AlignLeft)
+                self.preview_table.setItem(row, col, item)
+
+    def closeEvent(self, event):
+        self.preview_timer.stop()
+        if self.preview_worker is not None:
+            self.preview_worker.wait()
+        super().closeEvent(event)
+
 
     def apply_preset(self, index):
         if index == 0:
@@ -251,6 +476,7 @@ class SchedulerGUI(QWidget):
         for _, team_spins in self.structure_widgets:
             total += sum(spin.value() for spin in team_spins)
         self.team_count_label.setText(f"총 팀 수: {total}")
+        self.schedule_preview()
 
     def check_saturday(self):
         selected_date = self.calendar.selectedDate()
@@ -275,46 +501,39 @@ class SchedulerGUI(QWidget):
             qdate = self.calendar.selectedDate()
             opening_date = qdate.toPyDate()
 
-            allstar_fri, allstar_sat, allstar_sun = get_allstar_dates(opening_date.year, allstar_week_n)
-
-            teams = list(range(num_teams))
-            pairings = list(itertools.combinations(teams, 2))
-            all_series = []
-            for home, away in pairings:
-                home_games = games_between_teams // 2
-                away_games = games_between_teams - home_games
-                for l in generate_series(home_games):
-                    all_series.append({'home': home, 'away': away, 'length': l})
-                for l in generate_series(away_games):
-                    all_series.append({'home': away, 'away': home, 'length': l})
-
-            total_game_days = sum(s['length'] for s in all_series)
-            available_dates = get_available_dates(opening_date, allstar_fri, allstar_sat, allstar_sun, total_game_days + 20)
-
-            schedule = generate_schedule(num_teams, opening_date, games_between_teams, allstar_week_n, available_dates)
-
-            if self.stretch_check.isChecked():
-                schedule = stretch_schedule(schedule, opening_date, 170, allstar_week_n)
-
-            save_schedule_to_html(schedule, opening_date, num_teams)
-
-            QMessageBox.information(self, "달력 저장 완료", "calendar_schedule.html 파일이 생성되었습니다.")
+            # 미리보기가 같은 설정으로 이미 배정했으면 그 파이프라인을 그대로 씀 (진행 중이면 끝날 때까지 대기)
+            if self.preview_worker is not None and self.preview_worker.isRunning():
+                self.preview_worker.wait()
+            pipeline = get_stage_pipeline(self.preview_stage_cache, structure, opening_date, games_between_teams,
+                                          allstar_week_n, self.seed_input.value())
+            schedule = pipeline.season(self.stretch_check.isChecked(), 170, cache=ScheduleCache())
 
+            # 저장 위치를 먼저 받고 HTML/LSDL/컬럼 파일을 한 번에 동시 내보내기
             save_path, _ = QFileDialog.getSaveFileName(self, "OOTP 스케줄 저장", "ootp_schedule.lsdl", "LSDL Files (*.lsdl)")
+            columnar_path = None
+            if save_path and self.columnar_check.isChecked():
+                columnar_path = os.path.splitext(save_path)[0] + ".oksc"
+
+            result = pipeline.export(
+                schedule,
+                html=True,
+                lsdl_path=save_path or None,
+                columnar_path=columnar_path,
+                schedule_type=generate_type_attribute(games_between_teams, structure, num_teams),
+                inter_league="1" if self.inter_league_check.isChecked() else "0",
+                balanced_games="1" if self.balanced_check.isChecked() else "0"
+            )
+            if result["errors"]:
+                raise next(iter(result["errors"].values()))
+
             if save_path:
-                schedule_type = generate_type_attribute(games_between_teams, structure, num_teams)
-                export_schedule_to_ootp_xml(
-                    schedule,
-                    opening_date,
-                    num_teams,
-                    allstar_sat,
-                    schedule_type=schedule_type,
-                    inter_league="1" if self.inter_league_check.isChecked() else "0",
-                    balanced_games="1" if self.balanced_check.isChecked() else "0",
-                    filename=save_path
+                QMessageBox.information(
+                    self, "완료",
+                    f"calendar_schedule.html 파일이 생성되었습니다.\n스케줄이 저장되었습니다:\n{save_path}\n"
+                    f"랜덤 시드: {self.seed_input.value()}"
                 )
-                QMessageBox.information(self, "완료", f"스케줄이 저장되었습니다:\n{save_path}")
             else:
+                QMessageBox.information(self, "달력 저장 완료", "calendar_schedule.html 파일이 생성되었습니다.")
                 QMessageBox.warning(self, "경고", "파일 저장이 취소되었습니다.")
         except Exception as e:
             QMessageBox.critical(self, "오류", str(e))
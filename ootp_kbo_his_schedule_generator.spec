@@ -6,7 +6,7 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[('C:\\\\Users\\\\user\\\\OOTP_KBO_HIS_Scheduler\\\\대지 1.png', '.')],
-    hiddenimports=['holidays', 'holidays.countries', 'baseball_scheduler'],
+    hiddenimports=['holidays', 'holidays.countries', 'baseball_scheduler', 'schedule_cache', 'schedule_pipeline'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
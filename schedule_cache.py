@@ -0,0 +1,101 @@
+import os
+import json
+import pickle
+import hashlib
+import tempfile
+
+from baseball_scheduler import ENGINE_VERSION
+
+### 생성된 일정 캐시: 입력값 해시를 파일 이름으로 사용 (같은 입력이면 바로 불러옴)
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".ootp_kbo_scheduler", "cache")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def make_cache_key(structure, opening_date, games_between_teams, allstar_week_n,
+                   use_stretch=False, min_span=170, seed=None, start_rules=None):
+    payload = {
+        "structure": [list(division) for division in structure],
+        "opening_date": opening_date.isoformat(),
+        "games_between_teams": games_between_teams,
+        "allstar_week_n": allstar_week_n,
+        "stretch": [bool(use_stretch), min_span if use_stretch else None],
+        "seed": seed,
+        "start_rules": start_rules,
+        "engine": ENGINE_VERSION,
+    }
+    # 시작 규칙에 날짜가 들어 있을 수 있으므로 문자열로 직렬화
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ScheduleCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                schedule = pickle.load(f)
+        except Exception:
+            # 없거나, 다른 프로세스가 방금 지웠거나, 깨진 파일이거나, 다른 버전이 만든 pickle이면 캐시 미스
+            return None
+        try:
+            os.utime(path)  # LRU 순서를 위해 마지막 사용 시각 갱신
+        except OSError:
+            pass
+        return schedule
+
+    def put(self, key, schedule):
+        # 임시 파일에 다 쓴 뒤 os.replace로 교체 → 다른 프로세스는 완성된 파일만 보게 됨
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(schedule, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        self.evict()
+
+    def evict(self):
+        # 전체 크기가 max_bytes를 넘으면 가장 오래 안 쓴 파일부터 삭제
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".pkl"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue  # 다른 프로세스가 이미 지웠거나 사용 중
+            total -= size
+
+    def clear(self):
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".pkl") or name.endswith(".tmp"):
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+
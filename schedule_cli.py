@@ -0,0 +1,106 @@
+import sys
+import random
+import argparse
+from datetime import datetime
+
+from baseball_scheduler import get_allstar_dates, format_gap_report, reexport_loaded_schedule
+from schedule_cache import ScheduleCache
+from schedule_pipeline import SchedulePipeline
+
+### 콘솔 실행: 대화형으로 입력받아 생성 + 내보내기, 또는 --load로 기존 LSDL 검증/재내보내기
+# 라이브러리(baseball_scheduler)는 파이프라인을 import하지 않고, 이 모듈만 두 쪽을 모두 import함
+
+
+### 대화형 입력
+def get_user_input():
+    num_teams = int(input("팀 수를 입력하세요 (예: 10): "))
+    opening_date_str = input("개막일을 입력하세요 (YYYY-MM-DD 형식): ")
+    games_between_teams = int(input("각 팀 간 총 경기 수 (예: 16): "))
+    allstar_week_n = int(input("올스타 주간은 7월 몇 번째 주인가요? (예: 2): "))
+    opening_date = datetime.strptime(opening_date_str, "%Y-%m-%d").date()
+    return num_teams, opening_date, games_between_teams, allstar_week_n
+
+
+def get_ootp_header_input():
+    schedule_type = input("OOTP 스케줄 type을 입력하세요 (예: CUSTOM): ").strip()
+    inter_league = input("인터리그 여부? (1=사용, 0=비사용): ").strip()
+    balanced_games = input("균형 일정 여부? (1=사용, 0=비사용): ").strip()
+    return schedule_type, inter_league, balanced_games
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="KBO 스타일 OOTP 스케줄 생성기 (옵션 없이 실행하면 대화형 입력)")
+    parser.add_argument("--load", metavar="FILE", help="기존 .lsdl 스케줄을 불러와 검증하고 다시 내보냄")
+    parser.add_argument("--year", type=int, default=None, help="불러올 파일의 시즌 연도 (생략하면 개막 요일로 추정)")
+    parser.add_argument("--stretch", action="store_true", help="불러온 일정을 --min-span일 이상으로 늘림")
+    parser.add_argument("--min-span", type=int, default=170)
+    parser.add_argument("--output", default="ootp_schedule.lsdl", help="다시 내보낼 .lsdl 경로")
+    parser.add_argument("--html", action="store_true", help="HTML 달력도 저장")
+    args = parser.parse_args(argv)
+
+    if args.load:
+        _, problems, result = reexport_loaded_schedule(args.load, args.year, args.stretch, args.min_span,
+                                                       args.output, args.html)
+        for name, out in result["outputs"].items():
+            if out["error"] is not None:
+                print(f"  ❌ {name}: {out['error']}")
+        return 1 if problems or result["errors"] else 0
+
+    # 사용자 입력 받기
+    num_teams, opening_date, games_between_teams, allstar_week_n = get_user_input()
+
+    # 올스타 날짜 계산
+    allstar_fri, allstar_sat, allstar_sun = get_allstar_dates(opening_date.year, allstar_week_n)
+
+    # stretch 적용 여부 및 랜덤 시드 (같은 입력 + 같은 시드면 캐시된 일정을 바로 사용)
+    use_stretch = input("경기 일정을 최소 170일로 늘리는 stretch 기능을 사용할까요? (Y/N): ").strip().lower() == 'y'
+    seed_str = input("랜덤 시드를 입력하세요 (빈칸=새로 뽑기): ").strip()
+    if seed_str:
+        seed = int(seed_str)
+    else:
+        seed = random.randint(0, 999999)
+        print(f"🎲 랜덤 시드: {seed} (같은 일정을 다시 만들려면 이 시드를 입력하세요)")
+
+    # 스케줄 생성 (시리즈 → 날짜 → 배정 → stretch 단계를 파이프라인에서 한 번씩만 실행, 캐시 사용)
+    pipeline = SchedulePipeline([[num_teams]], opening_date, games_between_teams, allstar_week_n, seed=seed)
+    if use_stretch:
+        print("\n🔧 stretch 기능 적용 중...")
+    schedule = pipeline.season(use_stretch, 170, cache=ScheduleCache())
+    print(f"\n{format_gap_report(pipeline.gap(schedule))}")
+
+    if not use_stretch:
+        print("\n✅ stretch 미적용, 가능한 한 촘촘히 배정합니다.")
+        rest_days = [d for d in sorted(schedule)
+                     if d.weekday() != 0 and d not in {allstar_fri, allstar_sat, allstar_sun}
+                     and not schedule[d]]
+        if rest_days:
+            print(f"⚠️ 경기 없는 날이 {len(rest_days)}일 있습니다: 예시 → {[d.strftime('%Y-%m-%d') for d in rest_days[:3]]}")
+        else:
+            print("🎉 경기 없는 날 없이 촘촘하게 구성됐습니다.")
+
+    # OOTP XML 속성 입력 및 분석용 컬럼 파일 저장 여부 (내보내기 전에 모두 받음)
+    schedule_type, inter_league, balanced_games = get_ootp_header_input()
+    use_columnar = input("분석용 컬럼 파일(.oksc)도 저장할까요? (Y/N): ").strip().lower() == 'y'
+
+    # 콘솔 출력, HTML, OOTP XML, 컬럼 파일을 동시에 내보내기
+    result = pipeline.export(
+        schedule,
+        console=True,
+        html=True,
+        lsdl_path="ootp_schedule.lsdl",
+        columnar_path="ootp_schedule.oksc" if use_columnar else None,
+        schedule_type=schedule_type,
+        inter_league=inter_league,
+        balanced_games=balanced_games
+    )
+
+    print(f"\n⏱️ 내보내기 완료 ({result['seconds']:.2f}초)")
+    for name, out in result["outputs"].items():
+        if out["error"] is not None:
+            print(f"  ❌ {name}: {out['error']}")
+        else:
+            print(f"  {name}: {out['path'] or '-'} ({out['seconds']:.2f}초)")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
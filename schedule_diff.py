@@ -0,0 +1,29 @@
+import sys
+import argparse
+import contextlib
+
+from baseball_scheduler import diff_schedules, format_schedule_diff
+
+### 두 LSDL 스케줄 비교: 이동/추가/삭제된 시리즈, 홈/원정 변경, 시즌 기간 변화
+# 차이가 있으면 종료 코드 1 (diff 명령과 같은 규칙)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="두 OOTP .lsdl 스케줄의 시리즈 단위 차이 비교")
+    parser.add_argument("old", help="기준 .lsdl 파일")
+    parser.add_argument("new", help="비교할 .lsdl 파일")
+    parser.add_argument("--year", type=int, default=None, help="시즌 연도 (생략하면 개막 요일로 추정)")
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    # 불러오기 안내 메시지는 stderr로 보내서 --json 출력을 그대로 파이프할 수 있게 함
+    with contextlib.redirect_stdout(sys.stderr):
+        diff = diff_schedules(args.old, args.new, args.year)
+    print(format_schedule_diff(diff, as_json=args.json))
+
+    changed = diff["moved"] or diff["added"] or diff["removed"] or diff["home_away_changed"]
+    return 1 if changed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+from functools import cached_property
+
+from baseball_scheduler import (
+    get_allstar_dates,
+    build_series,
+    compute_season_lower_bound,
+    get_optimality_gap,
+    place_season,
+    stretch_schedule,
+    run_export_stage,
+)
+from schedule_cache import make_cache_key
+
+### 단계별 파이프라인: 시리즈 생성 → 시즌 길이 하한/날짜 계산 → 배정 → stretch → 내보내기
+# 각 단계 결과는 처음 필요할 때 한 번만 계산하고 객체에 보관 (GUI/CLI/미리보기가 같은 객체를 재사용)
+
+
+class SchedulePipeline:
+    def __init__(self, structure, opening_date, games_between_teams, allstar_week_n, seed=0, start_rules=None):
+        self.structure = [list(division) for division in structure]
+        self.opening_date = opening_date
+        self.games_between_teams = games_between_teams
+        self.allstar_week_n = allstar_week_n
+        self.seed = seed
+        self.start_rules = start_rules
+        self._stretched = {}
+
+    @cached_property
+    def num_teams(self):
+        return sum(sum(division) for division in self.structure)
+
+    @cached_property
+    def allstar_dates(self):
+        # (금, 토, 일) — 없는 주간이면 ValueError
+        return get_allstar_dates(self.opening_date.year, self.allstar_week_n)
+
+    # 1단계: 시리즈 목록
+    @cached_property
+    def series(self):
+        return build_series(self.num_teams, self.games_between_teams, self.start_rules)
+
+    # 2단계: 시즌 길이 하한 (배정 날짜 범위도 여기서 정함)
+    @cached_property
+    def lower_bound(self):
+        return compute_season_lower_bound(self.num_teams, self.opening_date, self.games_between_teams,
+                                          self.allstar_week_n, self.series, self.start_rules)
+
+    # 3단계: 배정 (사용한 날짜 목록도 함께 보관)
+    @cached_property
+    def _placement(self):
+        return place_season(self.num_teams, self.opening_date, self.games_between_teams, self.allstar_week_n,
+                            self.series, self.seed, self.start_rules, self.lower_bound)
+
+    @property
+    def placed(self):
+        return self._placement[0]
+
+    @property
+    def available_dates(self):
+        return self._placement[1]
+
+    def gap(self, schedule=None):
+        # 하한과의 차이 (schedule을 안 주면 배정 결과 기준)
+        return get_optimality_gap(self.placed if schedule is None else schedule, self.opening_date,
+                                  self.lower_bound)
+
+    # 4단계: stretch (min_span별로 한 번만)
+    def stretched(self, min_span=170):
+        if min_span not in self._stretched:
+            self._stretched[min_span] = stretch_schedule(self.placed, self.opening_date, min_span,
+                                                         self.allstar_week_n)
+        return self._stretched[min_span]
+
+    def season(self, use_stretch=False, min_span=170, cache=None):
+        # 최종 일정. cache(ScheduleCache)를 주면 디스크 캐시를 먼저 확인하고 없을 때만 단계를 실행
+        if cache is None or self.seed is None:
+            return self.stretched(min_span) if use_stretch else self.placed
+
+        key = make_cache_key(self.structure, self.opening_date, self.games_between_teams, self.allstar_week_n,
+                             use_stretch, min_span, self.seed, self.start_rules)
+        # 이 객체에서 이미 만든 단계(미리보기 등)가 있으면 디스크를 읽지 않고 그대로 씀
+        computed = min_span in self._stretched if use_stretch else "_placement" in self.__dict__
+        schedule = None if computed else cache.get(key)
+        if schedule is not None:
+            print(f"\n⚡ 캐시된 일정 사용: {key[:12]}")
+            return schedule
+
+        schedule = self.stretched(min_span) if use_stretch else self.placed
+        cache.put(key, schedule)
+        return schedule
+
+    # 5단계: 내보내기 (run_export_stage 인자를 그대로 전달, 경기 시간은 파이프라인 시드로 정함)
+    def export(self, schedule, **kwargs):
+        _, allstar_sat, _ = self.allstar_dates
+        kwargs.setdefault("seed", self.seed or 0)
+        return run_export_stage(schedule, self.opening_date, self.num_teams, allstar_sat, **kwargs)
+
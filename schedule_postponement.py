@@ -0,0 +1,231 @@
+import sys
+import time
+import random
+import argparse
+from datetime import datetime, timedelta
+
+from baseball_scheduler import (
+    load_schedule_from_ootp_xml,
+    export_schedule_to_ootp_xml,
+    prepare_schedule_view,
+    get_season_span,
+    validate_schedule,
+)
+
+### 우천 취소 시뮬레이션: 취소된 경기를 월요일이나 시즌 막판 빈 날짜로 재배정
+# 날짜 인덱스별로 "그 날 경기가 있는 팀" 비트마스크를 만들어 두고,
+# 재배정할 때는 일정을 다시 훑지 않고 (홈 | 원정) 비트만 확인함
+
+
+class PostponementIndex:
+    def __init__(self, schedule, extra_days=21):
+        first_day, last_day, span = get_season_span(schedule)
+        if first_day is None:
+            raise ValueError("경기가 없는 일정입니다.")
+        self.first_day = first_day
+        self.last_day = last_day
+        self.horizon = span + extra_days
+
+        # 올스타 주간(금/토/일)은 재배정 불가
+        blocked = bytearray(self.horizon)
+        busy = [0] * self.horizon
+        games = []
+        for d, day_games in schedule.items():
+            idx = (d - first_day).days
+            for g in day_games:
+                if g == ('올스타', '올스타'):
+                    for offset in (-1, 0, 1):
+                        if 0 <= idx + offset < self.horizon:
+                            blocked[idx + offset] = 1
+                    continue
+                home, away = g
+                busy[idx] |= (1 << home) | (1 << away)
+                games.append((idx, home, away))
+        games.sort()
+
+        self.blocked = blocked
+        self.busy = busy
+        self.games = games
+        self.last_idx = span - 1
+        # 월요일 여부 (monday_only 모드에서 사용)
+        self.is_monday = bytearray(
+            1 if (first_day + timedelta(days=i)).weekday() == 0 else 0 for i in range(self.horizon)
+        )
+
+    def reslot(self, postponed, monday_only=False):
+        # postponed: [(날짜 인덱스, 홈, 원정), ...] → (재배정 목록, 재배정 실패 목록, 새 마지막 날짜 인덱스)
+        busy = self.busy[:]
+        for idx, home, away in postponed:
+            busy[idx] &= ~((1 << home) | (1 << away))
+
+        blocked = self.blocked
+        is_monday = self.is_monday
+        last_idx = self.last_idx
+        horizon = self.horizon
+        moved = []
+        unplaced = []
+        new_last = -1
+
+        for idx, home, away in sorted(postponed):
+            pair = (1 << home) | (1 << away)
+            target = None
+            for day in range(idx + 1, horizon):
+                if blocked[day] or busy[day] & pair:
+                    continue
+                if day <= last_idx and monday_only and not is_monday[day]:
+                    continue
+                target = day
+                break
+            if target is None:
+                unplaced.append((idx, home, away))
+                continue
+            busy[target] |= pair
+            moved.append((idx, target, home, away))
+
+        # 실제 마지막 경기일 계산 (취소된 뒤 재배정된 경기 포함)
+        for day in range(horizon - 1, -1, -1):
+            if busy[day]:
+                new_last = day
+                break
+        return moved, unplaced, new_last
+
+    def sample_rainouts(self, rate, rng):
+        return [g for g in self.games if rng.random() < rate]
+
+
+def apply_postponements(schedule, postponed, extra_days=21, monday_only=False):
+    # postponed: [(date, home, away), ...] (팀 번호는 0부터) → (새 일정, 이동 목록, 실패 목록)
+    if len(set(postponed)) != len(postponed):
+        duplicates = sorted({g for g in postponed if postponed.count(g) > 1})
+        d, home, away = duplicates[0]
+        raise ValueError(f"같은 경기가 두 번 이상 지정됐습니다: {d} 팀 {away+1} @ 팀 {home+1}")
+    for d, home, away in postponed:
+        if (home, away) not in schedule.get(d, []):
+            raise ValueError(f"{d}에 팀 {away+1} @ 팀 {home+1} 경기가 없습니다.")
+
+    index = PostponementIndex(schedule, extra_days)
+    first_day = index.first_day
+    postponed_idx = [((d - first_day).days, home, away) for d, home, away in postponed]
+    moved, unplaced, _ = index.reslot(postponed_idx, monday_only)
+
+    new_schedule = {d: list(games) for d, games in schedule.items()}
+    for idx, target, home, away in moved:
+        old_date = first_day + timedelta(days=idx)
+        new_date = first_day + timedelta(days=target)
+        new_schedule[old_date].remove((home, away))
+        new_schedule.setdefault(new_date, []).append((home, away))
+
+    moved_dates = [
+        (first_day + timedelta(days=idx), first_day + timedelta(days=target), home, away)
+        for idx, target, home, away in moved
+    ]
+    unplaced_dates = [(first_day + timedelta(days=idx), home, away) for idx, home, away in unplaced]
+    return new_schedule, moved_dates, unplaced_dates
+
+
+def simulate_rainouts(schedule, rate=0.03, trials=1000, seed=0, extra_days=21,
+                      deadline=None, monday_only=False):
+    # 몬테카를로: 매 시행마다 각 경기를 rate 확률로 취소하고 재배정 → 시즌이 며칠 늘어나는지 집계
+    index = PostponementIndex(schedule, extra_days)
+    rng = random.Random(seed)
+    deadline_idx = (deadline - index.first_day).days if deadline is not None else None
+
+    extensions = []
+    failed_trials = 0
+    late_trials = 0
+    total_rainouts = 0
+    for _ in range(trials):
+        postponed = index.sample_rainouts(rate, rng)
+        total_rainouts += len(postponed)
+        _, unplaced, new_last = index.reslot(postponed, monday_only)
+        if unplaced:
+            failed_trials += 1
+        if deadline_idx is not None and new_last > deadline_idx:
+            late_trials += 1
+        extensions.append(max(0, new_last - index.last_idx))
+
+    extensions.sort()
+    n = len(extensions)
+    return {
+        "trials": trials,
+        "rate": rate,
+        "avg_rainouts": total_rainouts / n if n else 0,
+        "avg_extension": sum(extensions) / n if n else 0,
+        "p50_extension": extensions[n // 2] if n else 0,
+        "p90_extension": extensions[min(n - 1, int(n * 0.9))] if n else 0,
+        "max_extension": extensions[-1] if n else 0,
+        "failed_trials": failed_trials,
+        "late_trials": late_trials,
+        "last_day": index.last_day,
+    }
+
+
+def parse_postponed(value):
+    # "YYYY-MM-DD:홈:원정" (팀 번호는 1부터)
+    day, home, away = value.split(":")
+    return datetime.strptime(day, "%Y-%m-%d").date(), int(home) - 1, int(away) - 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="우천 취소 경기 재배정 / 몬테카를로 시뮬레이션")
+    parser.add_argument("schedule", help="OOTP .lsdl 스케줄 파일")
+    parser.add_argument("--year", type=int, default=None, help="시즌 연도 (생략하면 개막 요일로 추정)")
+    parser.add_argument("--postpone", type=parse_postponed, nargs="*", default=[],
+                        help="취소할 경기 목록 (YYYY-MM-DD:홈:원정)")
+    parser.add_argument("--rate", type=float, default=0.03, help="경기당 우천 취소 확률")
+    parser.add_argument("--trials", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--extra-days", type=int, default=21, help="시즌 종료 후 재배정에 쓸 수 있는 날 수")
+    parser.add_argument("--deadline", type=lambda v: datetime.strptime(v, "%Y-%m-%d").date(),
+                        help="이 날짜까지 모든 경기가 끝나야 함")
+    parser.add_argument("--monday-only", action="store_true", help="시즌 중에는 월요일에만 재배정")
+    parser.add_argument("--output", help="--postpone 결과를 저장할 .lsdl 경로 (헤더 속성은 원본 그대로)")
+    args = parser.parse_args(argv)
+
+    schedule, info = load_schedule_from_ootp_xml(args.schedule, args.year)
+
+    if args.postpone:
+        try:
+            new_schedule, moved, unplaced = apply_postponements(schedule, args.postpone, args.extra_days,
+                                                                args.monday_only)
+        except ValueError as e:
+            parser.error(str(e))
+        for old_date, new_date, home, away in moved:
+            print(f"  ☔ 팀 {away+1} @ 팀 {home+1}: {old_date} → {new_date}")
+        for old_date, home, away in unplaced:
+            print(f"  ❌ 팀 {away+1} @ 팀 {home+1}: {old_date} 재배정 실패")
+
+        # 재배정 경기는 월요일에도 들어갈 수 있으므로 월요일 경기는 문제로 보지 않음
+        problems = validate_schedule(new_schedule, info["num_teams"], info["games_per_team"],
+                                     info["allstar_sat"], allow_monday=True)
+        for p in problems[:20]:
+            print(f"  ⚠️ {p}")
+
+        if args.output:
+            # 옮기지 않은 경기는 원래 시간 유지, 재배정된 경기만 새 날짜 기준으로 시간을 정함
+            view = prepare_schedule_view(new_schedule, info["opening_date"], game_times=info["game_times"])
+            export_schedule_to_ootp_xml(
+                new_schedule, info["opening_date"], info["num_teams"], info["allstar_sat"],
+                schedule_type=info["type"], inter_league=info["inter_league"],
+                balanced_games=info["balanced_games"], filename=args.output, view=view
+            )
+        return 1 if unplaced or problems else 0
+
+    start = time.perf_counter()
+    result = simulate_rainouts(schedule, args.rate, args.trials, args.seed, args.extra_days,
+                               args.deadline, args.monday_only)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n☔ 우천 취소 시뮬레이션 ({result['trials']}회, 취소 확률 {result['rate']:.1%}, {elapsed:.2f}초)")
+    print(f"  기존 마지막 경기일: {result['last_day']}")
+    print(f"  평균 취소 경기: {result['avg_rainouts']:.1f}")
+    print(f"  시즌 연장: 평균 {result['avg_extension']:.1f}일 / 중앙값 {result['p50_extension']}일 / "
+          f"90% {result['p90_extension']}일 / 최대 {result['max_extension']}일")
+    print(f"  재배정 실패 시행: {result['failed_trials']}회")
+    if args.deadline is not None:
+        print(f"  {args.deadline} 이후 종료된 시행: {result['late_trials']}회")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
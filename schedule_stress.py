@@ -0,0 +1,186 @@
+import io
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import contextlib
+import traceback
+import multiprocessing
+from datetime import date, timedelta
+
+from baseball_scheduler import validate_schedule, extract_series
+from schedule_pipeline import SchedulePipeline
+
+### 스트레스/퍼즈 테스트: GUI에서 고를 수 있는 범위 안의 랜덤 설정으로
+# generate_schedule → stretch_schedule → export 전체 과정을 케이스마다 시간 제한을 두고 실행
+# 실패(예외, 빠진 시리즈, 시간 초과)와 가장 느린 케이스를 시드와 함께 기록 → --replay 시드로 재현
+
+# 예전에 깨졌던 설정: 랜덤 케이스보다 먼저 매번 실행
+REGRESSION_CASES = [
+    # 2연전이 없는 시즌(팀 간 18경기, 1991~2012 8팀 프리셋 범위): 토요일 개막 때
+    # 토/일/(월 휴식)/화로 끊긴 "3연전"이 생기면 안 됨 → 개막 주말은 비어 있어야 함
+    {"seed": 0, "structure": [[8]], "num_teams": 8, "opening_date": "2024-03-23",
+     "games_between_teams": 18, "allstar_week_n": 2, "use_stretch": False},
+]
+
+
+def make_case(case_seed):
+    # 같은 시드면 항상 같은 설정 (GUI 범위: 서브리그 1~2, 디비전 1~3, 디비전 내 팀 1~20)
+    rng = random.Random(case_seed)
+    structure = [
+        [rng.randint(1, 20) for _ in range(rng.randint(1, 3))]
+        for _ in range(rng.randint(1, 2))
+    ]
+    year = rng.randint(1982, 2030)
+    saturdays = []
+    d = date(year, 1, 1) + timedelta(days=(5 - date(year, 1, 1).weekday()) % 7)
+    while d.year == year:
+        saturdays.append(d)
+        d += timedelta(days=7)
+    return {
+        "seed": case_seed,
+        "structure": structure,
+        "num_teams": sum(sum(division) for division in structure),
+        "opening_date": rng.choice(saturdays).isoformat(),
+        "games_between_teams": rng.randint(1, 100),
+        "allstar_week_n": rng.randint(1, 5),
+        "use_stretch": rng.random() < 0.5,
+    }
+
+
+def run_case(case, export_dir):
+    num_teams = case["num_teams"]
+    opening_date = date.fromisoformat(case["opening_date"])
+    games_between_teams = case["games_between_teams"]
+    allstar_week_n = case["allstar_week_n"]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        pipeline = SchedulePipeline(case["structure"], opening_date, games_between_teams, allstar_week_n,
+                                    seed=case["seed"])
+        schedule = pipeline.season(case["use_stretch"], 170)
+        _, allstar_sat, _ = pipeline.allstar_dates
+        filename = os.path.join(export_dir, f"stress_{case['seed']}.lsdl")
+        result = pipeline.export(schedule, lsdl_path=filename)
+    if result["errors"]:
+        raise next(iter(result["errors"].values()))
+    os.remove(filename)
+
+    problems = validate_schedule(schedule, num_teams, games_between_teams * (num_teams - 1), allstar_sat)
+    if problems:
+        return "dropped", f"{len(problems)}건: {problems[0]}"
+
+    # stretch 전 일정은 모든 시리즈가 연속된 날짜여야 함 → 가장 짧은 연전보다 짧게 끊긴 구간이 있으면 실패
+    if not case["use_stretch"]:
+        shortest = min(s['length'] for s in pipeline.series)
+        for (home, away, n), (start, length) in extract_series(schedule).items():
+            if length < shortest:
+                return "broken", f"팀 {away+1} @ 팀 {home+1} #{n}: {start}에 {length}경기만 이어짐"
+    return "ok", ""
+
+
+def _case_worker(case, export_dir, conn):
+    try:
+        status, detail = run_case(case, export_dir)
+    except Exception as e:
+        status, detail = "error", f"{type(e).__name__}: {e}"
+    conn.send((status, detail))
+    conn.close()
+
+
+def run_case_with_timeout(case, export_dir, time_limit):
+    # 케이스마다 별도 프로세스에서 실행 → 시간 초과 시 강제 종료
+    parent_conn, child_conn = multiprocessing.Pipe(duplex=False)
+    proc = multiprocessing.Process(target=_case_worker, args=(case, export_dir, child_conn), daemon=True)
+    start = time.perf_counter()
+    proc.start()
+    child_conn.close()
+
+    if parent_conn.poll(time_limit):
+        try:
+            status, detail = parent_conn.recv()
+        except EOFError:
+            status, detail = "error", f"프로세스가 비정상 종료됐습니다 (exit code {proc.exitcode})"
+    else:
+        status, detail = "timeout", f"{time_limit}초 초과"
+        proc.terminate()
+    proc.join()
+    parent_conn.close()
+    return status, detail, time.perf_counter() - start
+
+
+def run_stress(cases, master_seed=0, time_limit=30.0, slowest=10, export_dir=None):
+    # export_dir를 주지 않으면 임시 디렉터리를 쓰고 끝나면 (실패한 케이스 파일까지) 지움
+    if export_dir is None:
+        with tempfile.TemporaryDirectory(prefix="ootp_stress_") as tmp_dir:
+            return run_stress(cases, master_seed, time_limit, slowest, tmp_dir)
+
+    rng = random.Random(master_seed)
+    failures = []
+    timings = []
+
+    all_cases = REGRESSION_CASES + [make_case(rng.randrange(2 ** 32)) for _ in range(cases)]
+    for i, case in enumerate(all_cases):
+        status, detail, elapsed = run_case_with_timeout(case, export_dir, time_limit)
+        record = dict(case, status=status, detail=detail, seconds=round(elapsed, 3))
+        timings.append(record)
+        mark = "✅" if status == "ok" else "❌"
+        print(f"{mark} [{i+1}/{len(all_cases)}] seed={case['seed']} 팀 {case['num_teams']} / {case['games_between_teams']}경기 / "
+              f"{case['opening_date']} / 올스타 {case['allstar_week_n']}주 → {status} ({elapsed:.2f}초) {detail}")
+        if status != "ok":
+            failures.append(record)
+
+    timings.sort(key=lambda r: r["seconds"], reverse=True)
+    return {
+        "master_seed": master_seed,
+        "cases": cases,
+        "regressions": len(REGRESSION_CASES),
+        "time_limit": time_limit,
+        "failures": failures,
+        "slowest": timings[:slowest],
+    }
+
+
+def replay_case(case_seed):
+    # 프로세스 분리 없이 바로 실행해서 전체 traceback 확인
+    case = make_case(case_seed)
+    print(json.dumps(case, ensure_ascii=False, indent=2))
+    start = time.perf_counter()
+    try:
+        with tempfile.TemporaryDirectory(prefix="ootp_stress_") as export_dir:
+            status, detail = run_case(case, export_dir)
+    except Exception:
+        traceback.print_exc()
+        return 1
+    print(f"→ {status} ({time.perf_counter() - start:.2f}초) {detail}")
+    return 0 if status == "ok" else 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="랜덤 설정으로 일정 생성 전체 과정을 반복 실행하는 스트레스 테스트")
+    parser.add_argument("--cases", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0, help="케이스 시드를 만드는 마스터 시드")
+    parser.add_argument("--time-limit", type=float, default=30.0, help="케이스당 제한 시간(초)")
+    parser.add_argument("--slowest", type=int, default=10, help="리포트에 남길 가장 느린 케이스 수")
+    parser.add_argument("--report", default="stress_report.json")
+    parser.add_argument("--replay", type=int, default=None, help="이 케이스 시드 하나만 다시 실행")
+    args = parser.parse_args(argv)
+
+    if args.replay is not None:
+        return replay_case(args.replay)
+
+    report = run_stress(args.cases, args.seed, args.time_limit, args.slowest)
+    with open(args.report, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"\n🧪 {report['cases']}개 케이스 (+ 회귀 {report['regressions']}개) 중 실패 {len(report['failures'])}개")
+    for r in report["slowest"][:3]:
+        print(f"  🐢 seed={r['seed']} {r['seconds']}초 (팀 {r['num_teams']}, {r['games_between_teams']}경기)")
+    print(f"📄 리포트 저장: {args.report}")
+    return 1 if report["failures"] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,182 @@
+import io
+import csv
+import sys
+import time
+import argparse
+import contextlib
+from functools import lru_cache
+from datetime import datetime, timedelta, date
+from concurrent.futures import ProcessPoolExecutor
+
+from baseball_scheduler import (
+    get_allstar_dates,
+    build_series,
+    get_available_dates,
+    compute_season_lower_bound,
+    get_optimality_gap,
+    place_season,
+    stretch_schedule,
+    get_season_span,
+    validate_schedule,
+)
+
+### 설정 탐색: 개막 토요일 × 올스타 주간 × 팀 간 경기 수 조합을 프로세스 풀로 한 번에 검사
+SWEEP_COLUMNS = [
+    "opening_date", "allstar_week", "games_between_teams", "feasible", "reason",
+    "first_game", "last_game", "season_days", "games_per_team", "bound_days", "gap", "seed",
+]
+
+
+def get_opening_saturdays(start, end):
+    d = start + timedelta(days=(5 - start.weekday()) % 7)
+    result = []
+    while d <= end:
+        result.append(d)
+        d += timedelta(days=7)
+    return result
+
+
+@lru_cache(maxsize=None)
+def get_cached_series(num_teams, games_between_teams):
+    # 시리즈 목록은 (팀 수, 경기 수)에만 의존 → 워커 프로세스 안에서 모든 조합이 공유
+    return tuple(build_series(num_teams, games_between_teams))
+
+
+def evaluate_calendar(task):
+    # 같은 (개막일, 올스타 주간)은 한 작업으로 묶어서 날짜 목록을 한 번만 만들고 경기 수/시드별로 재사용
+    num_teams, opening_date, allstar_week_n, games_list, target_date, use_stretch, min_span, seed, seeds = task
+    rows = []
+
+    def row(games, feasible, reason, first_day=None, last_day=None, span=0, per_team=0, gap=None, used_seed=""):
+        return {
+            "opening_date": opening_date.isoformat(),
+            "allstar_week": allstar_week_n,
+            "games_between_teams": games,
+            "feasible": feasible,
+            "reason": reason,
+            "first_game": first_day.isoformat() if first_day else "",
+            "last_game": last_day.isoformat() if last_day else "",
+            "season_days": span,
+            "games_per_team": per_team,
+            "bound_days": gap["bound_days"] if gap else "",
+            "gap": gap["gap"] if gap else "",
+            "seed": used_seed,
+        }
+
+    try:
+        allstar_fri, allstar_sat, allstar_sun = get_allstar_dates(opening_date.year, allstar_week_n)
+    except ValueError as e:
+        return [row(games, False, str(e)) for games in games_list]
+
+    # 날짜 목록은 이 달력에서 한 번만 만들고, place_season이 더 긴 범위를 쓰면 그 목록으로 바꿔서 계속 재사용
+    # (get_available_dates는 같은 개막일이면 짧은 목록이 긴 목록의 앞부분과 같음)
+    # 처음 크기는 하한 계산에 필요한 날 수 이상: 팀당 경기 수, 홀수 팀이면 팀 간 경기 수 × 팀 수
+    min_days = max(games for games in games_list) * num_teams
+    available_dates = get_available_dates(opening_date, allstar_fri, allstar_sat, allstar_sun, min_days)
+
+    for games in games_list:
+        per_team = games * (num_teams - 1)
+        all_series = get_cached_series(num_teams, games)
+        bound = compute_season_lower_bound(num_teams, opening_date, games, allstar_week_n, all_series,
+                                           available_dates=available_dates)
+
+        # 시드를 바꿔가며 배정해서 가장 짧은 일정을 고름. 하한에 닿으면 더 볼 필요 없음
+        best = None
+        for s in range(seed, seed + seeds):
+            with contextlib.redirect_stdout(io.StringIO()):
+                schedule, used_dates = place_season(num_teams, opening_date, games, allstar_week_n, all_series, s,
+                                                    bound=bound, available_dates=available_dates)
+            if len(used_dates) > len(available_dates):
+                available_dates = used_dates
+            gap = get_optimality_gap(schedule, opening_date, bound)
+            complete = not validate_schedule(schedule, num_teams, per_team, allstar_sat)
+            if best is None or (complete, -gap["gap"]) > (best[1], -best[2]["gap"]):
+                best = (schedule, complete, gap, s)
+            if complete and gap["gap"] <= 0:
+                break
+        schedule, _, gap, used_seed = best
+
+        if use_stretch:
+            with contextlib.redirect_stdout(io.StringIO()):
+                schedule = stretch_schedule(schedule, opening_date, min_span, allstar_week_n)
+
+        first_day, last_day, span = get_season_span(schedule)
+        problems = validate_schedule(schedule, num_teams, per_team, allstar_sat)
+        stats = (first_day, last_day, span, per_team, gap, used_seed)
+        if problems:
+            rows.append(row(games, False, f"불완전한 일정: {problems[0]}", *stats))
+        elif target_date is not None and last_day > target_date:
+            rows.append(row(games, False, f"{target_date} 이후 종료", *stats))
+        else:
+            rows.append(row(games, True, "", *stats))
+    return rows
+
+
+def run_sweep(num_teams, opening_dates, allstar_weeks, games_list, target_date=None,
+              use_stretch=False, min_span=170, seed=0, workers=None, seeds=1):
+    tasks = [
+        (num_teams, opening_date, week, list(games_list), target_date, use_stretch, min_span, seed, max(1, seeds))
+        for opening_date in opening_dates
+        for week in allstar_weeks
+    ]
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for result in pool.map(evaluate_calendar, tasks):
+            rows.extend(result)
+    return rows
+
+
+def write_sweep_table(rows, filename, sort_by=("feasible", "season_days")):
+    def sort_key(r):
+        # 가능한 조합 먼저, 그 다음 시즌 길이가 짧은 순
+        return tuple((not r[c]) if c == "feasible" else r[c] for c in sort_by)
+
+    rows = sorted(rows, key=sort_key)
+    with open(filename, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SWEEP_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return rows
+
+
+def parse_date(value):
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="개막일/올스타 주간/경기 수 조합별 일정 생성 가능 여부 탐색")
+    parser.add_argument("--teams", type=int, default=10, help="팀 수")
+    parser.add_argument("--year", type=int, default=date.today().year, help="시즌 연도")
+    parser.add_argument("--from", dest="from_date", type=parse_date, help="개막일 탐색 시작 (기본: 3월 1일)")
+    parser.add_argument("--to", dest="to_date", type=parse_date, help="개막일 탐색 끝 (기본: 4월 30일)")
+    parser.add_argument("--weeks", type=int, nargs="+", default=[1, 2, 3, 4, 5], help="올스타 주간 후보")
+    parser.add_argument("--games", type=int, nargs="+", default=[16], help="팀 간 경기 수 후보")
+    parser.add_argument("--target", type=parse_date, help="이 날짜까지 시즌이 끝나야 함 (YYYY-MM-DD)")
+    parser.add_argument("--stretch", action="store_true", help="170일 stretch 적용 후 평가")
+    parser.add_argument("--min-span", type=int, default=170)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--seeds", type=int, default=1,
+                        help="조합마다 시도할 시드 수 (하한에 닿으면 그 자리에서 멈춤)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default="schedule_sweep.csv")
+    args = parser.parse_args(argv)
+
+    from_date = args.from_date or date(args.year, 3, 1)
+    to_date = args.to_date or date(args.year, 4, 30)
+    opening_dates = get_opening_saturdays(from_date, to_date)
+
+    start = time.perf_counter()
+    rows = run_sweep(args.teams, opening_dates, args.weeks, args.games, args.target,
+                     args.stretch, args.min_span, args.seed, args.workers, args.seeds)
+    rows = write_sweep_table(rows, args.output)
+    elapsed = time.perf_counter() - start
+
+    feasible = sum(1 for r in rows if r["feasible"])
+    optimal = sum(1 for r in rows if r["gap"] != "" and r["gap"] <= 0)
+    print(f"\n🔎 {len(rows)}개 조합 중 {feasible}개 가능, {optimal}개 하한 도달 ({elapsed:.1f}초)")
+    print(f"📄 결과 저장: {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())